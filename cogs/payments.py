@@ -17,12 +17,124 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import sqlite3
-from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
+import asyncio
 import logging
+import queue
+import time
+from contextlib import contextmanager
 
 logger = logging.getLogger('MistressLIV.Payments')
 
+# Bump when _ensure_tables gains new DDL so existing databases re-run it. The version is kept
+# in this cog's own schema_versions row, since PRAGMA user_version is shared by every cog's tables
+SCHEMA_VERSION = 4
+
+# Leaderboard prefixes for the top three places
+MEDALS = ("🥇", "🥈", "🥉")
+
+# Number of persistent SQLite connections kept by the cog
+POOL_SIZE = 5
+
+# Seconds a computed leaderboard is reused before re-querying
+LEADERBOARD_CACHE_TTL = 30
+
+# Team role names (abbreviations and nicknames), uppercased for O(1) membership checks
+TEAM_ROLES = frozenset({
+    'ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE',
+    'DAL', 'DEN', 'DET', 'GB', 'HOU', 'IND', 'JAX', 'KC',
+    'LAC', 'LAR', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG',
+    'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS',
+    '49ERS', 'BEARS', 'BENGALS', 'BILLS', 'BRONCOS', 'BROWNS',
+    'BUCCANEERS', 'CARDINALS', 'CHARGERS', 'CHIEFS', 'COLTS',
+    'COMMANDERS', 'COWBOYS', 'DOLPHINS', 'EAGLES', 'FALCONS',
+    'GIANTS', 'JAGUARS', 'JETS', 'LIONS', 'PACKERS', 'PANTHERS',
+    'PATRIOTS', 'RAIDERS', 'RAMS', 'RAVENS', 'SAINTS', 'SEAHAWKS',
+    'STEELERS', 'TEXANS', 'TITANS', 'VIKINGS',
+})
+
+# Hot per-user queries, kept as constants so the connection's statement cache reuses them.
+# Debt lists are capped at 25 rows per source (more than fits in an embed field), keeping the
+# latest seasons' largest payouts and newest manual payments; every row also carries the
+# uncapped total so the footer needs no second query.
+SQL_OWED_TO_ME = '''
+    SELECT debts.*,
+           (SELECT COALESCE(SUM(amount), 0) FROM payments
+            WHERE payee_discord_id = ?1 AND is_paid = 0) +
+           (SELECT COALESCE(SUM(amount), 0) FROM manual_payments
+            WHERE creditor_id = ?1 AND is_paid = 0) AS total
+    FROM (
+        SELECT * FROM (
+            SELECT 'gen' AS src, payer_discord_id AS other_id, amount,
+                   season, NULL AS reason, NULL AS created_at
+            FROM payments
+            WHERE payee_discord_id = ?1 AND is_paid = 0
+            ORDER BY season DESC, amount DESC
+            LIMIT 25
+        )
+        UNION ALL
+        SELECT * FROM (
+            SELECT 'man', debtor_id, amount,
+                   NULL, reason, created_at
+            FROM manual_payments
+            WHERE creditor_id = ?1 AND is_paid = 0
+            ORDER BY created_at DESC
+            LIMIT 25
+        )
+    ) debts
+    ORDER BY src, created_at DESC, season DESC, amount DESC
+'''
+
+SQL_I_OWE = '''
+    SELECT debts.*,
+           (SELECT COALESCE(SUM(amount), 0) FROM payments
+            WHERE payer_discord_id = ?1 AND is_paid = 0) +
+           (SELECT COALESCE(SUM(amount), 0) FROM manual_payments
+            WHERE debtor_id = ?1 AND is_paid = 0) AS total
+    FROM (
+        SELECT * FROM (
+            SELECT 'gen' AS src, payee_discord_id AS other_id, amount,
+                   season, NULL AS reason, NULL AS created_at
+            FROM payments
+            WHERE payer_discord_id = ?1 AND is_paid = 0
+            ORDER BY season DESC, amount DESC
+            LIMIT 25
+        )
+        UNION ALL
+        SELECT * FROM (
+            SELECT 'man', creditor_id, amount,
+                   NULL, reason, created_at
+            FROM manual_payments
+            WHERE debtor_id = ?1 AND is_paid = 0
+            ORDER BY created_at DESC
+            LIMIT 25
+        )
+    ) debts
+    ORDER BY src, created_at DESC, season DESC, amount DESC
+'''
+
+# Only the displayed schedule rows are fetched; each carries the full outstanding count and sum
+SQL_SCHEDULE = '''
+    SELECT payer_discord_id, payee_discord_id, amount,
+           (SELECT COUNT(*) FROM payments WHERE is_paid = 0) AS outstanding,
+           (SELECT COALESCE(SUM(amount), 0) FROM payments WHERE is_paid = 0) AS outstanding_total
+    FROM payments WHERE is_paid = 0
+    ORDER BY season DESC, amount DESC
+    LIMIT 25
+'''
+
+SQL_STATUS_TOTALS = '''
+    SELECT
+        (SELECT COALESCE(SUM(amount), 0) FROM manual_payments
+         WHERE creditor_id = ?1 AND is_paid = 0),
+        (SELECT COALESCE(SUM(amount), 0) FROM payments
+         WHERE payee_discord_id = ?1 AND is_paid = 0),
+        (SELECT COALESCE(SUM(amount), 0) FROM manual_payments
+         WHERE debtor_id = ?1 AND is_paid = 0),
+        (SELECT COALESCE(SUM(amount), 0) FROM payments
+         WHERE payer_discord_id = ?1 AND is_paid = 0)
+'''
+
 
 class PaymentsCog(commands.Cog):
     """Cog for user-facing payment tracking and management."""
@@ -30,51 +142,278 @@ class PaymentsCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db_path = bot.db_path
+        # Leaderboard results keyed by write version; bumped whenever paid payments change
+        self._lb_cache = {}
+        self._lb_version = 0
+        # Persistent connections reused across commands instead of connect/close per call
+        self._pool = queue.Queue()
+        for _ in range(POOL_SIZE):
+            self._pool.put(self._open_connection())
         self._ensure_tables()
-        
-    def get_db_connection(self):
-        """Get a database connection."""
-        return sqlite3.connect(self.db_path)
-    
-    def _ensure_tables(self):
-        """Ensure all required tables exist."""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS manual_payments (
-                payment_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                season INTEGER,
-                debtor_id INTEGER NOT NULL,
-                creditor_id INTEGER NOT NULL,
-                amount REAL NOT NULL,
-                reason TEXT,
-                is_paid INTEGER DEFAULT 0,
-                paid_date TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                created_by INTEGER
-            )
+        # Names already stored in user_names, so a repeat command with the same name skips the write
+        self._names: Dict[int, str] = dict(self._fetch_all('SELECT discord_id, display_name FROM user_names'))
+        
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a pooled connection; WAL lets readers run alongside a writer."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        # Keep temp B-trees in memory, map up to 256 MiB of the file, and cache ~20 MB of pages
+        conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-20000;
         ''')
-        
-        conn.commit()
-        conn.close()
+        return conn
+    
+    @contextmanager
+    def acquire(self):
+        """Borrow a connection from the pool, returning it when the block exits."""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
     
+    def cog_unload(self):
+        """Close pooled connections when the cog is unloaded."""
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+    
+    def _ensure_tables(self):
+        """Ensure all required tables and indexes exist, migrating at most once per schema version."""
+        with self.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS schema_versions (
+                    component TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL
+                )
+            ''')
+            
+            # bot.py creates payments with season_year, so this index normally does not exist; where a
+            # season column has been added, (is_paid, season, amount) serves the schedule's ORDER BY
+            # without a sort. Checked on every load rather than behind the version gate, so a column
+            # added after the migration still gets its index
+            cursor.execute('PRAGMA table_info(payments)')
+            if 'season' in {col[1] for col in cursor.fetchall()}:
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_pay_unpaid_season_amount ON payments(is_paid, season, amount)')
+            
+            cursor.execute("SELECT version FROM schema_versions WHERE component = 'payments'")
+            row = cursor.fetchone()
+            if row and row[0] >= SCHEMA_VERSION:
+                return
+            
+            # Indexes cover the per-user unpaid lookups (manual ones already in
+            # created_at order); the partial covering indexes let the leaderboard
+            # GROUP BY stream in index order. A failed statement leaves the explicit
+            # transaction open, so roll it back before the connection returns to the pool
+            try:
+                cursor.executescript(f'''
+                    BEGIN;
+                    CREATE TABLE IF NOT EXISTS manual_payments (
+                        payment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        season INTEGER,
+                        debtor_id INTEGER NOT NULL,
+                        creditor_id INTEGER NOT NULL,
+                        amount REAL NOT NULL,
+                        reason TEXT,
+                        is_paid INTEGER DEFAULT 0,
+                        paid_date TEXT,
+                        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                        created_by INTEGER
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_mp_creditor_unpaid_created
+                        ON manual_payments(creditor_id, is_paid, created_at);
+                    CREATE INDEX IF NOT EXISTS idx_mp_debtor_unpaid_created
+                        ON manual_payments(debtor_id, is_paid, created_at);
+                    CREATE INDEX IF NOT EXISTS idx_p_payee_unpaid ON payments(payee_discord_id, is_paid);
+                    CREATE INDEX IF NOT EXISTS idx_p_payer_unpaid ON payments(payer_discord_id, is_paid);
+                    CREATE INDEX IF NOT EXISTS idx_payments_paid_payee_amount
+                        ON payments(payee_discord_id, amount) WHERE is_paid = 1;
+                    CREATE INDEX IF NOT EXISTS idx_payments_paid_payer_amount
+                        ON payments(payer_discord_id, amount) WHERE is_paid = 1;
+                    CREATE TABLE IF NOT EXISTS user_names (
+                        discord_id INTEGER PRIMARY KEY,
+                        display_name TEXT NOT NULL
+                    );
+                    INSERT INTO schema_versions (component, version) VALUES ('payments', {SCHEMA_VERSION})
+                        ON CONFLICT(component) DO UPDATE SET version = excluded.version;
+                    COMMIT;
+                ''')
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+        logger.info(f"Payments schema migrated to version {SCHEMA_VERSION}")
+
     def _get_user_team(self, member: discord.Member) -> Optional[str]:
         """Get a user's team from their roles."""
-        team_roles = ['ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 
-                      'DAL', 'DEN', 'DET', 'GB', 'HOU', 'IND', 'JAX', 'KC',
-                      'LAC', 'LAR', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG',
-                      'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS',
-                      '49ERS', 'BEARS', 'BENGALS', 'BILLS', 'BRONCOS', 'BROWNS',
-                      'BUCCANEERS', 'CARDINALS', 'CHARGERS', 'CHIEFS', 'COLTS',
-                      'COMMANDERS', 'COWBOYS', 'DOLPHINS', 'EAGLES', 'FALCONS',
-                      'GIANTS', 'JAGUARS', 'JETS', 'LIONS', 'PACKERS', 'PANTHERS',
-                      'PATRIOTS', 'RAIDERS', 'RAMS', 'RAVENS', 'SAINTS', 'SEAHAWKS',
-                      'STEELERS', 'TEXANS', 'TITANS', 'VIKINGS']
-        for role in member.roles:
-            if role.name.upper() in team_roles:
-                return role.name
-        return None
+        return next((role.name for role in member.roles if role.name.upper() in TEAM_ROLES), None)
+
+    def _fetch_all(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Run a read query on a pooled connection; call through asyncio.to_thread."""
+        with self.acquire() as conn:
+            return conn.execute(sql, params).fetchall()
+    
+    def _mark_paid(self, debtor_id: int, creditor_id: int) -> int:
+        """Mark every unpaid payment from debtor to creditor as paid, returning the count."""
+        with self.acquire() as conn:
+            cursor = conn.cursor()
+            
+            # Both updates share one transaction (committed, or rolled back on error)
+            with conn:
+                cursor.execute('''
+                    UPDATE manual_payments SET is_paid = 1, paid_date = CURRENT_TIMESTAMP
+                    WHERE debtor_id = ? AND creditor_id = ? AND is_paid = 0
+                ''', (debtor_id, creditor_id))
+                manual_count = cursor.rowcount
+                
+                cursor.execute('''
+                    UPDATE payments SET is_paid = 1, paid_date = CURRENT_TIMESTAMP
+                    WHERE payer_discord_id = ? AND payee_discord_id = ? AND is_paid = 0
+                ''', (debtor_id, creditor_id))
+                generated_count = cursor.rowcount
+        return manual_count + generated_count
+    
+    def _clear_payments(self, debtor_id: int, creditor_id: int) -> int:
+        """Delete all payment records from debtor to creditor, returning the count."""
+        with self.acquire() as conn:
+            cursor = conn.cursor()
+            
+            with conn:
+                cursor.execute('''
+                    DELETE FROM manual_payments
+                    WHERE debtor_id = ? AND creditor_id = ?
+                ''', (debtor_id, creditor_id))
+                manual_count = cursor.rowcount
+                
+                cursor.execute('''
+                    DELETE FROM payments
+                    WHERE payer_discord_id = ? AND payee_discord_id = ?
+                ''', (debtor_id, creditor_id))
+                generated_count = cursor.rowcount
+        return manual_count + generated_count
+    
+    def _clear_single_payment(self, debtor_id: int, creditor_id: int, amount: float) -> int:
+        """Delete the oldest unpaid payment of the given amount, manual payments first."""
+        with self.acquire() as conn:
+            cursor = conn.cursor()
+            
+            # Pinning the DELETE to one payment_id keeps duplicates intact
+            with conn:
+                cursor.execute('''
+                    DELETE FROM manual_payments WHERE payment_id = (
+                        SELECT payment_id FROM manual_payments
+                        WHERE debtor_id = ? AND creditor_id = ? AND amount = ? AND is_paid = 0
+                        ORDER BY created_at, payment_id
+                        LIMIT 1
+                    )
+                ''', (debtor_id, creditor_id, amount))
+                if cursor.rowcount:
+                    return cursor.rowcount
+                
+                cursor.execute('''
+                    DELETE FROM payments WHERE payment_id = (
+                        SELECT payment_id FROM payments
+                        WHERE payer_discord_id = ? AND payee_discord_id = ? AND amount = ? AND is_paid = 0
+                        ORDER BY payment_id
+                        LIMIT 1
+                    )
+                ''', (debtor_id, creditor_id, amount))
+                return cursor.rowcount
+    
+    def _create_many(self, rows: List[tuple]):
+        """Insert manual payments as (debtor_id, creditor_id, amount, reason, created_by) rows in one transaction."""
+        with self.acquire() as conn:
+            with conn:
+                conn.executemany('''
+                    INSERT INTO manual_payments (debtor_id, creditor_id, amount, reason, created_by)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', rows)
+    
+    def _get_leaderboards(self) -> Dict[str, List[tuple]]:
+        """Get the top-15 earners and losers as (name, total) rows, computed together and cached briefly."""
+        # Read the version once: a write landing mid-query must not file old totals under the new version
+        version = self._lb_version
+        cached = self._lb_cache.get(version)
+        if cached and time.monotonic() - cached[0] < LEADERBOARD_CACHE_TTL:
+            return cached[1]
+        
+        with self.acquire() as conn:
+            cursor = conn.cursor()
+            
+            # Paid-out and earned totals per user from a single pass over paid payments,
+            # with display names joined from the user_names cache
+            cursor.execute('''
+                SELECT COALESCE(u.display_name, 'User ' || t.user_id) AS name,
+                       t.paid_out, t.earned, t.is_payer, t.is_payee
+                FROM (
+                    SELECT user_id, SUM(paid) AS paid_out, SUM(earned) AS earned,
+                           MAX(is_payer) AS is_payer, MAX(is_payee) AS is_payee
+                    FROM (
+                        SELECT payer_discord_id AS user_id, amount AS paid, 0 AS earned,
+                               1 AS is_payer, 0 AS is_payee
+                        FROM payments WHERE is_paid = 1
+                        UNION ALL
+                        SELECT payee_discord_id, 0, amount, 0, 1
+                        FROM payments WHERE is_paid = 1
+                    )
+                    GROUP BY user_id
+                ) t
+                LEFT JOIN user_names u ON u.discord_id = t.user_id
+            ''')
+            rows = cursor.fetchall()
+        
+        earners = sorted(
+            [(name, earned) for name, paid_out, earned, is_payer, is_payee in rows if is_payee],
+            key=lambda row: row[1], reverse=True
+        )[:15]
+        losers = sorted(
+            [(name, paid_out) for name, paid_out, earned, is_payer, is_payee in rows if is_payer],
+            key=lambda row: row[1], reverse=True
+        )[:15]
+        
+        result = {'earners': earners, 'losers': losers}
+        self._lb_cache = {version: (time.monotonic(), result)}
+        return result
+    
+    async def _prefetch_members(self, guild: discord.Guild, user_ids):
+        """Load uncached members into the guild cache with one gateway request."""
+        missing = [user_id for user_id in set(user_ids) if guild.get_member(user_id) is None]
+        if not missing:
+            return
+        try:
+            # query_members caps user_ids at 100 per request
+            await guild.query_members(user_ids=missing[:100], limit=len(missing[:100]))
+        except Exception as e:
+            logger.warning(f"Could not prefetch {len(missing)} member(s): {e}")
+    
+    def _resolve_names(self, guild: discord.Guild, user_ids) -> Dict[int, str]:
+        """Resolve display names for a batch of user IDs, one cache lookup per unique ID."""
+        names = {}
+        for user_id in set(user_ids):
+            member = guild.get_member(user_id)
+            names[user_id] = member.display_name if member else f"User {user_id}"
+        return names
+
+    def _record_name(self, user_id: int, display_name: str):
+        """Upsert a user's current display name into the user_names cache."""
+        with self.acquire() as conn:
+            with conn:
+                conn.execute('''
+                    INSERT INTO user_names (discord_id, display_name) VALUES (?, ?)
+                    ON CONFLICT(discord_id) DO UPDATE SET display_name = excluded.display_name
+                ''', (user_id, display_name))
+    
+    @commands.Cog.listener()
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        """Cache the invoking user's display name (members intent is not enabled), writing only on change."""
+        user = interaction.user
+        if user.bot or self._names.get(user.id) == user.display_name:
+            return
+        self._names[user.id] = user.display_name
+        await asyncio.to_thread(self._record_name, user.id, user.display_name)
 
     # ==================== PAYMENTS COMMAND GROUP ====================
     
@@ -83,165 +422,111 @@ class PaymentsCog(commands.Cog):
     @payments_group.command(name="owedtome", description="See who owes you money")
     async def payments_owed_to_me(self, interaction: discord.Interaction):
         """Show all unpaid debts owed TO the user."""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get from manual payments
-        cursor.execute('''
-            SELECT payment_id, debtor_id, amount, reason, created_at
-            FROM manual_payments
-            WHERE creditor_id = ? AND is_paid = 0
-            ORDER BY created_at DESC
-        ''', (interaction.user.id,))
-        manual_debts = cursor.fetchall()
+        await interaction.response.defer()
         
-        # Get from generated payments table
-        cursor.execute('''
-            SELECT payment_id, payer_discord_id, amount, season, round
-            FROM payments
-            WHERE payee_discord_id = ? AND is_paid = 0
-        ''', (interaction.user.id,))
-        generated_debts = cursor.fetchall()
+        # Generated and manual payments in one round-trip, tagged by source
+        rows = await asyncio.to_thread(self._fetch_all, SQL_OWED_TO_ME, (interaction.user.id,))
         
-        conn.close()
+        generated_debts = [(row[1], row[2], row[3]) for row in rows if row[0] == 'gen']
+        manual_debts = [(row[1], row[2], row[4]) for row in rows if row[0] == 'man']
         
         if not manual_debts and not generated_debts:
-            await interaction.response.send_message("✅ No one owes you money right now!", ephemeral=True)
+            await interaction.followup.send("✅ No one owes you money right now!")
             return
         
-        embed = discord.Embed(
-            title="💰 Money Owed TO You",
-            color=discord.Color.green()
-        )
-        
-        total = 0
+        names = self._resolve_names(interaction.guild, [row[1] for row in rows])
+        total = rows[0][6]
+        fields = []
         
         if generated_debts:
-            debt_text = ""
-            for payment_id, debtor_id, amount, season, round_name in generated_debts:
-                member = interaction.guild.get_member(debtor_id)
-                name = member.display_name if member else f"User {debtor_id}"
-                debt_text += f"• **{name}**: ${amount:.2f} (SZN {season})\n"
-                total += amount
-            embed.add_field(name="📊 Playoff Payouts", value=debt_text[:1024], inline=False)
+            debt_text = "".join([
+                f"• **{names[debtor_id]}**: ${amount:.2f} (SZN {season})\n"
+                for debtor_id, amount, season in generated_debts
+            ])
+            fields.append({'name': "📊 Playoff Payouts", 'value': debt_text[:1024], 'inline': False})
         
         if manual_debts:
-            debt_text = ""
-            for payment_id, debtor_id, amount, reason, created_at in manual_debts:
-                member = interaction.guild.get_member(debtor_id)
-                name = member.display_name if member else f"User {debtor_id}"
-                debt_text += f"• **{name}**: ${amount:.2f} - {reason or 'No reason'}\n"
-                total += amount
-            embed.add_field(name="📝 Other Payments", value=debt_text[:1024], inline=False)
-        
-        embed.set_footer(text=f"Total Owed to You: ${total:.2f}")
-        await interaction.response.send_message(embed=embed)
+            debt_text = "".join([
+                f"• **{names[debtor_id]}**: ${amount:.2f} - {reason or 'No reason'}\n"
+                for debtor_id, amount, reason in manual_debts
+            ])
+            fields.append({'name': "📝 Other Payments", 'value': debt_text[:1024], 'inline': False})
+        
+        # Build the embed from one payload rather than field by field
+        embed = discord.Embed.from_dict({
+            'title': "💰 Money Owed TO You",
+            'color': discord.Color.green().value,
+            'fields': fields,
+            'footer': {'text': f"Total Owed to You: ${total:.2f}"},
+        })
+        await interaction.followup.send(embed=embed)
     
     @payments_group.command(name="iowe", description="See who you owe money to")
     async def payments_i_owe(self, interaction: discord.Interaction):
         """Show all unpaid debts the user owes."""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get from manual payments
-        cursor.execute('''
-            SELECT payment_id, creditor_id, amount, reason, created_at
-            FROM manual_payments
-            WHERE debtor_id = ? AND is_paid = 0
-            ORDER BY created_at DESC
-        ''', (interaction.user.id,))
-        manual_debts = cursor.fetchall()
+        await interaction.response.defer()
         
-        # Get from generated payments table
-        cursor.execute('''
-            SELECT payment_id, payee_discord_id, amount, season, round
-            FROM payments
-            WHERE payer_discord_id = ? AND is_paid = 0
-        ''', (interaction.user.id,))
-        generated_debts = cursor.fetchall()
+        # Generated and manual payments in one round-trip, tagged by source
+        rows = await asyncio.to_thread(self._fetch_all, SQL_I_OWE, (interaction.user.id,))
         
-        conn.close()
+        generated_debts = [(row[1], row[2], row[3]) for row in rows if row[0] == 'gen']
+        manual_debts = [(row[1], row[2], row[4]) for row in rows if row[0] == 'man']
         
         if not manual_debts and not generated_debts:
-            await interaction.response.send_message("✅ You don't owe anyone money!", ephemeral=True)
+            await interaction.followup.send("✅ You don't owe anyone money!")
             return
         
-        embed = discord.Embed(
-            title="💸 Money You Owe",
-            color=discord.Color.red()
-        )
-        
-        total = 0
+        names = self._resolve_names(interaction.guild, [row[1] for row in rows])
+        total = rows[0][6]
+        fields = []
         
         if generated_debts:
-            debt_text = ""
-            for payment_id, creditor_id, amount, season, round_name in generated_debts:
-                member = interaction.guild.get_member(creditor_id)
-                name = member.display_name if member else f"User {creditor_id}"
-                debt_text += f"• **{name}**: ${amount:.2f} (SZN {season})\n"
-                total += amount
-            embed.add_field(name="📊 Playoff Payouts", value=debt_text[:1024], inline=False)
+            debt_text = "".join([
+                f"• **{names[creditor_id]}**: ${amount:.2f} (SZN {season})\n"
+                for creditor_id, amount, season in generated_debts
+            ])
+            fields.append({'name': "📊 Playoff Payouts", 'value': debt_text[:1024], 'inline': False})
         
         if manual_debts:
-            debt_text = ""
-            for payment_id, creditor_id, amount, reason, created_at in manual_debts:
-                member = interaction.guild.get_member(creditor_id)
-                name = member.display_name if member else f"User {creditor_id}"
-                debt_text += f"• **{name}**: ${amount:.2f} - {reason or 'No reason'}\n"
-                total += amount
-            embed.add_field(name="📝 Other Payments", value=debt_text[:1024], inline=False)
-        
-        embed.set_footer(text=f"Total You Owe: ${total:.2f}")
-        await interaction.response.send_message(embed=embed)
+            debt_text = "".join([
+                f"• **{names[creditor_id]}**: ${amount:.2f} - {reason or 'No reason'}\n"
+                for creditor_id, amount, reason in manual_debts
+            ])
+            fields.append({'name': "📝 Other Payments", 'value': debt_text[:1024], 'inline': False})
+        
+        # Build the embed from one payload rather than field by field
+        embed = discord.Embed.from_dict({
+            'title': "💸 Money You Owe",
+            'color': discord.Color.red().value,
+            'fields': fields,
+            'footer': {'text': f"Total You Owe: ${total:.2f}"},
+        })
+        await interaction.followup.send(embed=embed)
     
     @payments_group.command(name="status", description="View your complete payment status")
     async def payments_status(self, interaction: discord.Interaction):
         """View complete payment status for the user."""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        # Money owed to user
-        cursor.execute('''
-            SELECT COALESCE(SUM(amount), 0) FROM manual_payments
-            WHERE creditor_id = ? AND is_paid = 0
-        ''', (interaction.user.id,))
-        manual_owed_to = cursor.fetchone()[0]
-        
-        cursor.execute('''
-            SELECT COALESCE(SUM(amount), 0) FROM payments
-            WHERE payee_discord_id = ? AND is_paid = 0
-        ''', (interaction.user.id,))
-        generated_owed_to = cursor.fetchone()[0]
-        
-        # Money user owes
-        cursor.execute('''
-            SELECT COALESCE(SUM(amount), 0) FROM manual_payments
-            WHERE debtor_id = ? AND is_paid = 0
-        ''', (interaction.user.id,))
-        manual_owes = cursor.fetchone()[0]
-        
-        cursor.execute('''
-            SELECT COALESCE(SUM(amount), 0) FROM payments
-            WHERE payer_discord_id = ? AND is_paid = 0
-        ''', (interaction.user.id,))
-        generated_owes = cursor.fetchone()[0]
-        
-        conn.close()
+        await interaction.response.defer()
+        
+        # Money owed to user and money user owes, in one round-trip
+        rows = await asyncio.to_thread(self._fetch_all, SQL_STATUS_TOTALS, (interaction.user.id,))
+        manual_owed_to, generated_owed_to, manual_owes, generated_owes = rows[0]
         
         total_owed_to = manual_owed_to + generated_owed_to
         total_owes = manual_owes + generated_owes
         net = total_owed_to - total_owes
         
-        embed = discord.Embed(
-            title=f"💰 Payment Status - {interaction.user.display_name}",
-            color=discord.Color.green() if net >= 0 else discord.Color.red()
-        )
-        
-        embed.add_field(name="💵 Owed to You", value=f"${total_owed_to:.2f}", inline=True)
-        embed.add_field(name="💸 You Owe", value=f"${total_owes:.2f}", inline=True)
-        embed.add_field(name="📊 Net", value=f"${net:+.2f}", inline=True)
+        embed = discord.Embed.from_dict({
+            'title': f"💰 Payment Status - {interaction.user.display_name}",
+            'color': (discord.Color.green() if net >= 0 else discord.Color.red()).value,
+            'fields': [
+                {'name': "💵 Owed to You", 'value': f"${total_owed_to:.2f}", 'inline': True},
+                {'name': "💸 You Owe", 'value': f"${total_owes:.2f}", 'inline': True},
+                {'name': "📊 Net", 'value': f"${net:+.2f}", 'inline': True},
+            ],
+        })
         
-        await interaction.response.send_message(embed=embed)
+        await interaction.followup.send(embed=embed)
     
     @payments_group.command(name="schedule", description="View all outstanding payments (posts to #payouts)")
     @app_commands.checks.has_permissions(administrator=True)
@@ -249,16 +534,7 @@ class PaymentsCog(commands.Cog):
         """Post all outstanding payments to #payouts channel."""
         await interaction.response.defer()
         
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT payer_discord_id, payee_discord_id, amount, season, round
-            FROM payments WHERE is_paid = 0
-            ORDER BY season DESC, amount DESC
-        ''')
-        payments = cursor.fetchall()
-        conn.close()
+        payments = await asyncio.to_thread(self._fetch_all, SQL_SCHEDULE)
         
         if not payments:
             await interaction.followup.send("✅ No outstanding payments!")
@@ -269,15 +545,18 @@ class PaymentsCog(commands.Cog):
             color=discord.Color.blue()
         )
         
-        payment_text = ""
-        total = 0
-        for payer_id, payee_id, amount, season, round_name in payments[:25]:
-            payer = interaction.guild.get_member(payer_id)
-            payee = interaction.guild.get_member(payee_id)
-            payer_name = payer.display_name if payer else f"User {payer_id}"
-            payee_name = payee.display_name if payee else f"User {payee_id}"
-            payment_text += f"• {payer_name} → {payee_name}: ${amount:.2f}\n"
-            total += amount
+        user_ids = [row[0] for row in payments] + [row[1] for row in payments]
+        await self._prefetch_members(interaction.guild, user_ids)
+        names = self._resolve_names(interaction.guild, user_ids)
+        
+        payment_text = "".join([
+            f"• {names[payer_id]} → {names[payee_id]}: ${amount:.2f}\n"
+            for payer_id, payee_id, amount, _, _ in payments
+        ])
+        overflow = payments[0][3] - len(payments)
+        if overflow > 0:
+            payment_text += f"... and {overflow} more\n"
+        total = payments[0][4]
         
         embed.description = payment_text
         embed.set_footer(text=f"Total Outstanding: ${total:.2f}")
@@ -301,16 +580,9 @@ class PaymentsCog(commands.Cog):
         reason: Optional[str] = None
     ):
         """Create a manual payment obligation."""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO manual_payments (debtor_id, creditor_id, amount, reason, created_by)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (debtor.id, creditor.id, amount, reason, interaction.user.id))
-        
-        conn.commit()
-        conn.close()
+        await asyncio.to_thread(
+            self._create_many, [(debtor.id, creditor.id, amount, reason, interaction.user.id)]
+        )
         
         embed = discord.Embed(
             title="💰 Payment Created",
@@ -328,27 +600,9 @@ class PaymentsCog(commands.Cog):
     @app_commands.describe(debtor="User who paid you")
     async def payments_paid(self, interaction: discord.Interaction, debtor: discord.Member):
         """Mark payments from a user as paid."""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        # Update manual payments
-        cursor.execute('''
-            UPDATE manual_payments SET is_paid = 1, paid_date = ?
-            WHERE debtor_id = ? AND creditor_id = ? AND is_paid = 0
-        ''', (datetime.now().isoformat(), debtor.id, interaction.user.id))
-        manual_count = cursor.rowcount
-        
-        # Update generated payments
-        cursor.execute('''
-            UPDATE payments SET is_paid = 1, paid_date = ?
-            WHERE payer_discord_id = ? AND payee_discord_id = ? AND is_paid = 0
-        ''', (datetime.now().isoformat(), debtor.id, interaction.user.id))
-        generated_count = cursor.rowcount
-        
-        conn.commit()
-        conn.close()
-        
-        total = manual_count + generated_count
+        total = await asyncio.to_thread(self._mark_paid, debtor.id, interaction.user.id)
+        self._lb_version += 1
+        
         if total > 0:
             await interaction.response.send_message(
                 f"✅ Marked {total} payment(s) from {debtor.mention} as paid!"
@@ -362,35 +616,24 @@ class PaymentsCog(commands.Cog):
     @payments_group.command(name="clear", description="[Admin] Delete a specific payment")
     @app_commands.describe(
         debtor="User who owes",
-        creditor="User who is owed"
+        creditor="User who is owed",
+        amount="Only delete the oldest unpaid payment of this amount"
     )
     @app_commands.checks.has_permissions(administrator=True)
     async def payments_clear(
         self,
         interaction: discord.Interaction,
         debtor: discord.Member,
-        creditor: discord.Member
+        creditor: discord.Member,
+        amount: Optional[float] = None
     ):
         """Delete payment records between two users."""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            DELETE FROM manual_payments
-            WHERE debtor_id = ? AND creditor_id = ?
-        ''', (debtor.id, creditor.id))
-        manual_count = cursor.rowcount
-        
-        cursor.execute('''
-            DELETE FROM payments
-            WHERE payer_discord_id = ? AND payee_discord_id = ?
-        ''', (debtor.id, creditor.id))
-        generated_count = cursor.rowcount
-        
-        conn.commit()
-        conn.close()
+        if amount is not None:
+            total = await asyncio.to_thread(self._clear_single_payment, debtor.id, creditor.id, amount)
+        else:
+            total = await asyncio.to_thread(self._clear_payments, debtor.id, creditor.id)
+        self._lb_version += 1
         
-        total = manual_count + generated_count
         await interaction.response.send_message(
             f"✅ Deleted {total} payment record(s) between {debtor.mention} and {creditor.mention}."
         )
@@ -402,22 +645,12 @@ class PaymentsCog(commands.Cog):
     @leaderboard_group.command(name="earners", description="View the top earners leaderboard")
     async def leaderboard_earners(self, interaction: discord.Interaction):
         """Show top earners leaderboard."""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get total earnings per user (money owed to them that's been paid)
-        cursor.execute('''
-            SELECT payee_discord_id, SUM(amount) as total
-            FROM payments WHERE is_paid = 1
-            GROUP BY payee_discord_id
-            ORDER BY total DESC
-            LIMIT 15
-        ''')
-        earners = cursor.fetchall()
-        conn.close()
+        await interaction.response.defer()
+        
+        earners = (await asyncio.to_thread(self._get_leaderboards))['earners']
         
         if not earners:
-            await interaction.response.send_message("📊 No earnings data yet!", ephemeral=True)
+            await interaction.followup.send("📊 No earnings data yet!")
             return
         
         embed = discord.Embed(
@@ -425,35 +658,24 @@ class PaymentsCog(commands.Cog):
             color=discord.Color.gold()
         )
         
-        leaderboard = ""
-        for i, (user_id, total) in enumerate(earners, 1):
-            member = interaction.guild.get_member(user_id)
-            name = member.display_name if member else f"User {user_id}"
-            medal = {1: "🥇", 2: "🥈", 3: "🥉"}.get(i, f"{i}.")
-            leaderboard += f"{medal} **{name}**: ${total:.2f}\n"
+        lines = []
+        for i, (name, total) in enumerate(earners, 1):
+            medal = MEDALS[i - 1] if i <= len(MEDALS) else f"{i}."
+            lines.append(f"{medal} **{name}**: ${total:.2f}\n")
+        leaderboard = "".join(lines)
         
         embed.description = leaderboard
-        await interaction.response.send_message(embed=embed)
+        await interaction.followup.send(embed=embed)
     
     @leaderboard_group.command(name="losers", description="View the biggest losers leaderboard")
     async def leaderboard_losers(self, interaction: discord.Interaction):
         """Show biggest losers leaderboard."""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get total paid out per user
-        cursor.execute('''
-            SELECT payer_discord_id, SUM(amount) as total
-            FROM payments WHERE is_paid = 1
-            GROUP BY payer_discord_id
-            ORDER BY total DESC
-            LIMIT 15
-        ''')
-        losers = cursor.fetchall()
-        conn.close()
+        await interaction.response.defer()
+        
+        losers = (await asyncio.to_thread(self._get_leaderboards))['losers']
         
         if not losers:
-            await interaction.response.send_message("📊 No payment data yet!", ephemeral=True)
+            await interaction.followup.send("📊 No payment data yet!")
             return
         
         embed = discord.Embed(
@@ -461,15 +683,14 @@ class PaymentsCog(commands.Cog):
             color=discord.Color.red()
         )
         
-        leaderboard = ""
-        for i, (user_id, total) in enumerate(losers, 1):
-            member = interaction.guild.get_member(user_id)
-            name = member.display_name if member else f"User {user_id}"
-            medal = {1: "🥇", 2: "🥈", 3: "🥉"}.get(i, f"{i}.")
-            leaderboard += f"{medal} **{name}**: ${total:.2f}\n"
+        lines = []
+        for i, (name, total) in enumerate(losers, 1):
+            medal = MEDALS[i - 1] if i <= len(MEDALS) else f"{i}."
+            lines.append(f"{medal} **{name}**: ${total:.2f}\n")
+        leaderboard = "".join(lines)
         
         embed.description = leaderboard
-        await interaction.response.send_message(embed=embed)
+        await interaction.followup.send(embed=embed)
 
 
 async def setup(bot):
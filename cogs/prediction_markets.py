@@ -24,12 +24,17 @@ import discord
 from discord.ext import commands, tasks
 from discord import app_commands
 import sqlite3
+import re
 import json
+import heapq
 import asyncio
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Tuple
+from typing import Optional, List, Dict, Tuple, Iterable, NamedTuple
 from decimal import Decimal, ROUND_HALF_UP
+from operator import attrgetter, itemgetter
 import aiohttp
 
 logger = logging.getLogger('MistressLIV.PredictionMarkets')
@@ -41,6 +46,10 @@ TRADE_INCREMENT = 5    # Must be in $5 increments
 MAX_SHARES_PER_USER_PER_MARKET = 500  # Volume cap
 BOT_LIQUIDITY_SEED = 100  # Initial bot liquidity per side
 SNALLABOT_API_BASE = "https://snallabot.me"
+CURRENT_WEEK_CACHE_TTL = 3600  # Seconds to reuse a guild's current week from Snallabot
+NFC_STATUS_CACHE_TTL = 60  # Seconds to reuse a guild's NFC requirement status
+EMBED_FIELD_LIMIT = 1024  # Discord's maximum length for an embed field value
+NFC_DM_CONCURRENCY = 5  # Reminder DMs in flight at once
 
 # Price is in cents (0-100), represents probability
 MIN_PRICE = 5   # 5 cents minimum
@@ -51,12 +60,37 @@ NFC_MIN_VOLUME_REQUIREMENT = 100  # $100 minimum for NFC members
 NFC_OWN_TEAM_PLAYOFF_BET = 50  # $50 must be on own team making playoffs
 NFC_DEADLINE_WEEK = 18  # Must be met by end of Week 18
 
+# Fixed text of the NFC reminder embeds
+NFC_REMINDER_FOOTER = (
+    f"Requirements: ${NFC_MIN_VOLUME_REQUIREMENT} total + ${NFC_OWN_TEAM_PLAYOFF_BET} on own team "
+    f"by Week {NFC_DEADLINE_WEEK}"
+)
+NFC_HOW_TO_PARTICIPATE = (
+    "1. View playoff markets: `/market view`\n"
+    "2. Bet on your team: `/trade [marketID] Yes buy 50 [odds]`\n"
+    "3. Check your status: `/nfcstatus`"
+)
+NFC_DM_QUICK_START = (
+    "1. `/market view` - See all markets\n"
+    "2. `/trade [marketID] Yes buy 50 [price]` - Place bet\n"
+    "3. `/nfcstatus` - Check your progress"
+)
+
 # NFC Teams mapping (abbreviation to full names)
-NFC_TEAMS = ['ARI', 'ATL', 'CAR', 'CHI', 'DAL', 'DET', 'GB', 'LAR', 
-             'MIN', 'NO', 'NYG', 'PHI', 'SF', 'SEA', 'TB', 'WAS',
-             'Cardinals', 'Falcons', 'Panthers', 'Bears', 'Cowboys', 'Lions',
-             'Packers', 'Rams', 'Vikings', 'Saints', 'Giants', 'Eagles',
-             '49ers', 'Seahawks', 'Buccaneers', 'Commanders']
+NFC_TEAMS = frozenset({'ARI', 'ATL', 'CAR', 'CHI', 'DAL', 'DET', 'GB', 'LAR', 
+                       'MIN', 'NO', 'NYG', 'PHI', 'SF', 'SEA', 'TB', 'WAS',
+                       'Cardinals', 'Falcons', 'Panthers', 'Bears', 'Cowboys', 'Lions',
+                       'Packers', 'Rams', 'Vikings', 'Saints', 'Giants', 'Eagles',
+                       '49ers', 'Seahawks', 'Buccaneers', 'Commanders'})
+# Uppercased once for role-name matching
+NFC_TEAMS_UPPER = frozenset(team.upper() for team in NFC_TEAMS)
+# A role counts as NFC if its name contains a team name (one regex scan) or is itself
+# part of one (every fragment of every team name, precomputed)
+NFC_TEAM_PATTERN = re.compile('|'.join(map(re.escape, sorted(NFC_TEAMS_UPPER))))
+NFC_TEAM_FRAGMENTS = frozenset(
+    team[start:end] for team in NFC_TEAMS_UPPER
+    for start in range(len(team) + 1) for end in range(start, len(team) + 1)
+)
 
 # Team abbreviation to market name mapping
 NFC_TEAM_MARKET_NAMES = {
@@ -66,6 +100,90 @@ NFC_TEAM_MARKET_NAMES = {
     'SF': '49ers', 'SEA': 'Seahawks', 'TB': 'Buccaneers', 'WAS': 'Commanders'
 }
 
+# Statements run on every fill, kept as constants so the connection's statement cache reuses them.
+# SQL_FILL_ORDER adds a fill to a resting order, closing it out once fully filled.
+SQL_FILL_ORDER = '''
+    UPDATE prediction_orders 
+    SET filled_quantity = filled_quantity + ?1,
+        status = CASE WHEN filled_quantity + ?1 >= quantity THEN 'filled' ELSE status END,
+        filled_at = CASE WHEN filled_quantity + ?1 >= quantity THEN ?2 ELSE filled_at END
+    WHERE order_id = ?3
+'''
+
+SQL_INSERT_FILLED_BOT_ORDER = '''
+    INSERT INTO prediction_orders 
+    (market_id, user_id, side, direction, quantity, price, filled_quantity, status, created_at, filled_at, is_bot_order)
+    VALUES (?, 0, ?, ?, ?, ?, ?, 'filled', ?, ?, 1)
+'''
+
+SQL_INSERT_TRADE = '''
+    INSERT INTO prediction_trades 
+    (market_id, buyer_id, seller_id, side, quantity, price, total_amount, executed_at, buyer_order_id, seller_order_id, guild_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+SQL_ADD_MARKET_VOLUME = '''
+    UPDATE prediction_markets 
+    SET total_volume = total_volume + ?
+    WHERE market_id = ?
+'''
+
+# Count, value and quantity of a market's last 10 Yes trades, for repricing after every trade.
+# Fills from one trade share executed_at, so trade_id keeps them in execution order.
+SQL_RECENT_YES_TRADES = '''
+    SELECT COUNT(*), SUM(price * quantity), SUM(quantity) FROM (
+        SELECT price, quantity FROM prediction_trades
+        WHERE market_id = ? AND side = 'Yes'
+        ORDER BY executed_at DESC, trade_id DESC
+        LIMIT 10
+    )
+'''
+
+SQL_SET_YES_PRICE = '''
+    UPDATE prediction_markets SET yes_price = ? WHERE market_id = ?
+'''
+
+# Upsert rather than INSERT OR REPLACE: an existing row is updated in place instead of being
+# deleted and re-inserted under a new id with every index rewritten
+SQL_SAVE_POSITION = '''
+    INSERT INTO prediction_positions 
+    (market_id, user_id, yes_shares, no_shares, avg_yes_price, avg_no_price, total_invested)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(market_id, user_id) DO UPDATE SET
+        yes_shares = excluded.yes_shares,
+        no_shares = excluded.no_shares,
+        avg_yes_price = excluded.avg_yes_price,
+        avg_no_price = excluded.avg_no_price,
+        total_invested = excluded.total_invested
+'''
+
+
+class NFCMemberStatus(NamedTuple):
+    """An NFC owner's progress toward the prediction market requirements (dollar amounts)."""
+    user_id: int
+    name: str
+    team: Optional[str]
+    volume: int
+    remaining: int
+    own_team_bet: int
+    own_team_remaining: int
+    met_volume_requirement: bool
+    met_own_team_requirement: bool
+    met_requirement: bool
+    far_behind: bool  # Below half of either requirement: gets a reminder DM near the deadline
+
+
+def _fmt_compliant(m: NFCMemberStatus) -> str:
+    """Format a fully compliant member's line for /nfc_status."""
+    return f"✅ **{m.name}** ({m.team}): ${m.volume} vol, ${m.own_team_bet} own team"
+
+
+def _fmt_noncompliant(m: NFCMemberStatus) -> str:
+    """Format a needs-action member's line for /nfc_status, marking each requirement."""
+    vol_status = "✅" if m.met_volume_requirement else "❌"
+    own_status = "✅" if m.met_own_team_requirement else "❌"
+    return f"**{m.name}** ({m.team}): {vol_status}${m.volume}vol {own_status}${m.own_team_bet}own"
+
 
 class PredictionMarketsCog(commands.Cog):
     """Cog for Kalshi-style prediction markets."""
@@ -73,6 +191,36 @@ class PredictionMarketsCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db_path = bot.db_path
+        # Long-lived connection shared by the trading helpers instead of connect/close per call
+        self._conn = self._open_connection()
+        # Every use of self._conn from a command runs on this one thread, keeping SQLite
+        # writes serialized while the event loop stays free
+        self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prediction-db')
+        # Positions keyed by (market_id, user_id); _update_position is their only writer, and
+        # rows changed inside a matching transaction are flushed together before it commits
+        self._pos_cache: Dict[Tuple[str, int], Dict] = {}
+        self._dirty_positions = set()
+        # Market rows keyed by market_id; every write to prediction_markets happens in this cog
+        # and updates or evicts the cached copy, so reads can skip the database
+        self._market_meta: Dict[str, Dict] = {}
+        # Open orders per market, one heap per (side, direction) with the best order on top.
+        # prediction_orders stays authoritative; the heaps are loaded from it on first use and
+        # changed only after the write they mirror has committed
+        self._books: Dict[str, Dict[Tuple[str, str], List[list]]] = {}
+        # Sorted _get_order_book views, dropped whenever their market's book changes
+        self._book_views: Dict[str, Dict[str, List[tuple]]] = {}
+        # (heap, entry) pairs popped by _match_order in the open transaction; see _return_taken_orders
+        self._taken_orders: List[Tuple[List[list], list]] = []
+        # Active league_config rows keyed by guild_id; see invalidate_snalla
+        self._snalla_cache: Dict[int, Dict] = {}
+        # Snallabot HTTP session (created on first use) and (fetched_at, week) per guild
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._week_cache: Dict[int, Tuple[float, int]] = {}
+        # (computed_at, lists) from _get_nfc_members_status per guild, dropped when a trade or
+        # settlement in the guild changes volumes or own-team bets
+        self._nfc_status_cache: Dict[int, Tuple[float, Dict]] = {}
+        # Channel ids found by name, keyed by (guild_id, names); cleared by the guild channel listeners
+        self._channel_ids: Dict[Tuple[int, Tuple[str, ...]], Optional[int]] = {}
         self._init_tables()
         self.update_market_odds.start()
         self.check_nfc_requirements.start()
@@ -80,11 +228,45 @@ class PredictionMarketsCog(commands.Cog):
     def cog_unload(self):
         self.update_market_odds.cancel()
         self.check_nfc_requirements.cancel()
+        if self._session and not self._session.closed:
+            asyncio.create_task(self._session.close())
+        self._db_executor.shutdown(wait=True)
+        # Refresh planner statistics before letting go of the connection
+        self._conn.execute('PRAGMA optimize')
+        self._conn.close()
+    
+    async def _run_db(self, func, *args):
+        """Run a blocking database helper on the cog's database thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._db_executor, func, *args)
+    
+    def _fetch_all(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Run a read query on the shared connection and return all rows."""
+        return self._conn.execute(sql, params).fetchall()
+    
+    def _fetch_one(self, sql: str, params: tuple = ()) -> Optional[tuple]:
+        """Run a read query on the shared connection and return the first row."""
+        return self._conn.execute(sql, params).fetchone()
+    
+    def _execute(self, sql: str, params: tuple = ()):
+        """Run a single write statement on the shared connection and commit it."""
+        self._conn.execute(sql, params)
+        self._conn.commit()
+    
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open the cog's shared connection; WAL lets the other cogs read alongside it."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-64000;
+        ''')
+        return conn
     
     def _init_tables(self):
         """Initialize prediction markets database tables."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         # Markets table
         cursor.execute('''
@@ -155,10 +337,22 @@ class PredictionMarketsCog(commands.Cog):
                 executed_at TEXT NOT NULL,
                 buyer_order_id INTEGER,
                 seller_order_id INTEGER,
+                guild_id INTEGER,
                 FOREIGN KEY (market_id) REFERENCES prediction_markets(market_id)
             )
         ''')
         
+        # Trades carry their market's guild so per-guild volume needs no join; older
+        # databases get the column added and backfilled once
+        cursor.execute('PRAGMA table_info(prediction_trades)')
+        if 'guild_id' not in [col[1] for col in cursor.fetchall()]:
+            cursor.execute('ALTER TABLE prediction_trades ADD COLUMN guild_id INTEGER')
+            cursor.execute('''
+                UPDATE prediction_trades SET guild_id = (
+                    SELECT m.guild_id FROM prediction_markets m WHERE m.market_id = prediction_trades.market_id
+                )
+            ''')
+        
         # User profits table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS prediction_profits (
@@ -187,18 +381,50 @@ class PredictionMarketsCog(commands.Cog):
             )
         ''')
         
-        conn.commit()
-        conn.close()
+        # Open orders in price-time priority, so book reads and matching are index range scans
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_orders_book_bids
+            ON prediction_orders(market_id, side, direction, price DESC, created_at)
+            WHERE status = 'open'
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_orders_book_asks
+            ON prediction_orders(market_id, side, direction, price, created_at)
+            WHERE status = 'open'
+        ''')
+        
+        # Most recent trades per market (price updates, market status)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_trades_market_time
+            ON prediction_trades(market_id, executed_at DESC)
+        ''')
+        
+        # Per-user lookups across markets (positions, open orders)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_positions_user_market ON prediction_positions(user_id, market_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_orders_user_status ON prediction_orders(user_id, status, market_id)')
+        
+        # Per-guild NFC trade volume, covering both sides of each trade
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_trades_guild_volume
+            ON prediction_trades(guild_id, buyer_id, seller_id, total_amount)
+        ''')
+        
+        # Markets by guild and status (market lists, NFC checks, the hourly odds loop)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_markets_guild_status ON prediction_markets(guild_id, status)')
+        
+        self._conn.commit()
+        
+        # Highest MKTnnn sequence handed out so far; new IDs count up from here
+        cursor.execute('''
+            SELECT COALESCE(MAX(CAST(SUBSTR(market_id, 4) AS INTEGER)), 0) FROM prediction_markets
+        ''')
+        self._last_market_seq = cursor.fetchone()[0]
         logger.info("Prediction markets tables initialized")
     
     def _generate_market_id(self) -> str:
-        """Generate a unique market ID."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT COUNT(*) FROM prediction_markets')
-        count = cursor.fetchone()[0]
-        conn.close()
-        return f"MKT{count + 1:03d}"
+        """Generate a unique market ID (runs on the DB thread, so increments never interleave)."""
+        self._last_market_seq += 1
+        return f"MKT{self._last_market_seq:03d}"
     
     def _validate_trade_amount(self, amount: int) -> Tuple[bool, str]:
         """Validate trade amount is in $5 increments."""
@@ -210,43 +436,47 @@ class PredictionMarketsCog(commands.Cog):
     
     def _get_user_position(self, market_id: str, user_id: int) -> Dict:
         """Get user's current position in a market."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        position = self._pos_cache.get((market_id, user_id))
+        if position is not None:
+            return dict(position)
+        
+        cursor = self._conn.cursor()
         cursor.execute('''
             SELECT yes_shares, no_shares, avg_yes_price, avg_no_price, total_invested
             FROM prediction_positions
             WHERE market_id = ? AND user_id = ?
         ''', (market_id, user_id))
         row = cursor.fetchone()
-        conn.close()
         
         if row:
-            return {
+            position = {
                 'yes_shares': row[0],
                 'no_shares': row[1],
                 'avg_yes_price': row[2],
                 'avg_no_price': row[3],
                 'total_invested': row[4]
             }
-        return {'yes_shares': 0, 'no_shares': 0, 'avg_yes_price': 0, 'avg_no_price': 0, 'total_invested': 0}
+        else:
+            position = {'yes_shares': 0, 'no_shares': 0, 'avg_yes_price': 0, 'avg_no_price': 0, 'total_invested': 0}
+        
+        self._pos_cache[(market_id, user_id)] = position
+        return dict(position)
     
-    def _update_position(self, market_id: str, user_id: int, side: str, quantity: int, price: int, is_buy: bool):
-        """Update user's position after a trade."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _update_position(self, market_id: str, user_id: int, side: str, quantity: int, price: int, is_buy: bool,
+                         cursor: Optional[sqlite3.Cursor] = None):
+        """Update user's position after a trade; a passed cursor leaves committing to the caller."""
+        own_transaction = cursor is None
+        if own_transaction:
+            cursor = self._conn.cursor()
         
         # Get current position
-        cursor.execute('''
-            SELECT yes_shares, no_shares, avg_yes_price, avg_no_price, total_invested
-            FROM prediction_positions
-            WHERE market_id = ? AND user_id = ?
-        ''', (market_id, user_id))
-        row = cursor.fetchone()
-        
-        if row:
-            yes_shares, no_shares, avg_yes, avg_no, invested = row
-        else:
-            yes_shares, no_shares, avg_yes, avg_no, invested = 0, 0, 0, 0, 0
+        key = (market_id, user_id)
+        if key not in self._pos_cache:
+            self._get_user_position(market_id, user_id)
+        position = self._pos_cache[key]
+        yes_shares, no_shares = position['yes_shares'], position['no_shares']
+        avg_yes, avg_no = position['avg_yes_price'], position['avg_no_price']
+        invested = position['total_invested']
         
         trade_value = quantity * price
         
@@ -275,173 +505,209 @@ class PredictionMarketsCog(commands.Cog):
                 no_shares = max(0, no_shares - quantity)
                 invested -= trade_value
         
-        cursor.execute('''
-            INSERT OR REPLACE INTO prediction_positions 
-            (market_id, user_id, yes_shares, no_shares, avg_yes_price, avg_no_price, total_invested)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (market_id, user_id, yes_shares, no_shares, avg_yes, avg_no, invested))
+        position.update(
+            yes_shares=yes_shares, no_shares=no_shares,
+            avg_yes_price=avg_yes, avg_no_price=avg_no, total_invested=invested
+        )
+        self._dirty_positions.add(key)
         
-        conn.commit()
-        conn.close()
+        if own_transaction:
+            self._flush_positions(cursor)
+            self._conn.commit()
+    
+    def _flush_positions(self, cursor: sqlite3.Cursor):
+        """Write every position changed since the last flush in one batch."""
+        if not self._dirty_positions:
+            return
+        rows = []
+        for market_id, user_id in self._dirty_positions:
+            position = self._pos_cache[(market_id, user_id)]
+            rows.append((
+                market_id, user_id, position['yes_shares'], position['no_shares'],
+                position['avg_yes_price'], position['avg_no_price'], position['total_invested']
+            ))
+        cursor.executemany(SQL_SAVE_POSITION, rows)
+        self._dirty_positions.clear()
+    
+    def _discard_dirty_positions(self):
+        """Drop cached positions changed by a transaction that rolled back."""
+        for key in self._dirty_positions:
+            self._pos_cache.pop(key, None)
+        self._dirty_positions.clear()
+    
+    def _forget_market(self, market_id: str):
+        """Evict a market's metadata, order book and positions from the caches once it stops trading."""
+        self._market_meta.pop(market_id, None)
+        self._books.pop(market_id, None)
+        self._book_views.pop(market_id, None)
+        for key in [key for key in self._pos_cache if key[0] == market_id]:
+            del self._pos_cache[key]
+    
+    def _get_market(self, market_id: str) -> Optional[Dict]:
+        """Get a market's metadata, loading it into the cache on first use."""
+        market = self._market_meta.get(market_id)
+        if market is None:
+            row = self._fetch_one('''
+                SELECT guild_id, question, yes_price, total_volume, resolution_week, status, created_by, created_at
+                FROM prediction_markets
+                WHERE market_id = ?
+            ''', (market_id,))
+            if not row:
+                return None
+            market = {
+                'guild_id': row[0],
+                'question': row[1],
+                'yes_price': row[2],
+                'total_volume': row[3],
+                'resolution_week': row[4],
+                'status': row[5],
+                'created_by': row[6],
+                'created_at': row[7]
+            }
+            self._market_meta[market_id] = market
+        return dict(market)
+    
+    def _add_market_volume(self, market_id: str, amount: int):
+        """Keep a cached market's volume in step with a fill; a rolled-back trade evicts the market."""
+        market = self._market_meta.get(market_id)
+        if market is not None:
+            market['total_volume'] += amount
+    
+    @staticmethod
+    def _book_entry(direction: str, order_id: int, user_id: int, remaining: int, price: int,
+                    is_bot: int, created_at: str) -> list:
+        """
+        Build an order book heap entry.
+        Entries sort by price (negated for bids, so the highest bid comes first), then age, then order_id.
+        """
+        sort_price = -price if direction == 'buy' else price
+        return [sort_price, created_at, order_id, remaining, user_id, is_bot, price]
+    
+    def _get_book(self, market_id: str) -> Dict[Tuple[str, str], List[list]]:
+        """Get a market's in-memory order book, loading its open orders on first use."""
+        book = self._books.get(market_id)
+        if book is None:
+            book = {(side, direction): [] for side in ('Yes', 'No') for direction in ('buy', 'sell')}
+            rows = self._fetch_all('''
+                SELECT side, direction, order_id, user_id, quantity - filled_quantity, price, is_bot_order, created_at
+                FROM prediction_orders
+                WHERE market_id = ? AND status = 'open' AND quantity > filled_quantity
+            ''', (market_id,))
+            for side, direction, *order in rows:
+                book[(side, direction)].append(self._book_entry(direction, *order))
+            for heap in book.values():
+                heapq.heapify(heap)
+            self._books[market_id] = book
+        return book
     
     def _get_order_book(self, market_id: str) -> Dict:
-        """Get the current order book for a market."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get open buy orders for Yes (sorted by price desc - best bids first)
-        cursor.execute('''
-            SELECT order_id, user_id, quantity - filled_quantity as remaining, price, is_bot_order
-            FROM prediction_orders
-            WHERE market_id = ? AND side = 'Yes' AND direction = 'buy' AND status = 'open'
-            AND quantity > filled_quantity
-            ORDER BY price DESC, created_at ASC
-        ''', (market_id,))
-        yes_bids = cursor.fetchall()
-        
-        # Get open sell orders for Yes (sorted by price asc - best asks first)
-        cursor.execute('''
-            SELECT order_id, user_id, quantity - filled_quantity as remaining, price, is_bot_order
-            FROM prediction_orders
-            WHERE market_id = ? AND side = 'Yes' AND direction = 'sell' AND status = 'open'
-            AND quantity > filled_quantity
-            ORDER BY price ASC, created_at ASC
-        ''', (market_id,))
-        yes_asks = cursor.fetchall()
-        
-        # Get open buy orders for No
-        cursor.execute('''
-            SELECT order_id, user_id, quantity - filled_quantity as remaining, price, is_bot_order
-            FROM prediction_orders
-            WHERE market_id = ? AND side = 'No' AND direction = 'buy' AND status = 'open'
-            AND quantity > filled_quantity
-            ORDER BY price DESC, created_at ASC
-        ''', (market_id,))
-        no_bids = cursor.fetchall()
-        
-        # Get open sell orders for No
-        cursor.execute('''
-            SELECT order_id, user_id, quantity - filled_quantity as remaining, price, is_bot_order
-            FROM prediction_orders
-            WHERE market_id = ? AND side = 'No' AND direction = 'sell' AND status = 'open'
-            AND quantity > filled_quantity
-            ORDER BY price ASC, created_at ASC
-        ''', (market_id,))
-        no_asks = cursor.fetchall()
-        
-        conn.close()
+        """Get the current order book for a market, sorting it only after it has changed."""
+        order_book = self._book_views.get(market_id)
+        if order_book is None:
+            book = self._get_book(market_id)
+            
+            # Bids best (highest) price first, asks lowest first, oldest first within a price level
+            def ordered(side: str, direction: str) -> List[tuple]:
+                return [
+                    (order_id, user_id, remaining, price, is_bot)
+                    for _, _, order_id, remaining, user_id, is_bot, price in sorted(book[(side, direction)])
+                ]
+            
+            order_book = {
+                'yes_bids': ordered('Yes', 'buy'),
+                'yes_asks': ordered('Yes', 'sell'),
+                'no_bids': ordered('No', 'buy'),
+                'no_asks': ordered('No', 'sell'),
+            }
+            self._book_views[market_id] = order_book
+        return {key: list(orders) for key, orders in order_book.items()}
+    
+    @staticmethod
+    def _plan_fills(matching_orders: List[tuple], quantity: int) -> Tuple[List[tuple], int]:
+        """
+        Decide how much to take from each resting order, best price first.
+        Pure arithmetic with no database access; returns the fills and the unfilled remainder.
+        """
+        fills = []
+        remaining = quantity
+        for order_id, counterparty_id, available, price, is_bot in matching_orders:
+            if remaining <= 0:
+                break
+            
+            fill_qty = min(remaining, available)
+            fills.append((order_id, counterparty_id, fill_qty, price, is_bot))
+            remaining -= fill_qty
         
-        return {
-            'yes_bids': yes_bids,
-            'yes_asks': yes_asks,
-            'no_bids': no_bids,
-            'no_asks': no_asks
-        }
+        return fills, remaining
     
-    def _match_order(self, market_id: str, user_id: int, side: str, direction: str, 
-                     quantity: int, limit_price: int) -> Dict:
+    def _match_order(self, cursor: sqlite3.Cursor, market_id: str, guild_id: int, user_id: int, side: str,
+                     direction: str, quantity: int, limit_price: int, now_iso: str) -> Dict:
         """
-        Match an order against the order book.
+        Match an order against the order book inside the caller's transaction.
         Returns dict with filled_quantity, avg_price, remaining, trades executed.
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         filled_quantity = 0
         total_cost = 0
         trades = []
-        remaining = quantity
         
-        # Determine which side of the book to match against
-        if direction == 'buy':
-            # Buying: match against sell orders (asks) at or below limit price
-            cursor.execute('''
-                SELECT order_id, user_id, quantity - filled_quantity as remaining, price, is_bot_order
-                FROM prediction_orders
-                WHERE market_id = ? AND side = ? AND direction = 'sell' AND status = 'open'
-                AND quantity > filled_quantity AND price <= ?
-                ORDER BY price ASC, created_at ASC
-            ''', (market_id, side, limit_price))
-        else:
-            # Selling: match against buy orders (bids) at or above limit price
-            cursor.execute('''
-                SELECT order_id, user_id, quantity - filled_quantity as remaining, price, is_bot_order
-                FROM prediction_orders
-                WHERE market_id = ? AND side = ? AND direction = 'buy' AND status = 'open'
-                AND quantity > filled_quantity AND price >= ?
-                ORDER BY price DESC, created_at ASC
-            ''', (market_id, side, limit_price))
+        # Buying matches sell orders (asks) at or below the limit price; selling matches
+        # buy orders (bids) at or above it
+        book_side = self._get_book(market_id)[(side, 'sell' if direction == 'buy' else 'buy')]
+        limit_key = limit_price if direction == 'buy' else -limit_price
+        
+        # Pop the best resting orders until the quantity is covered. Own orders are never
+        # matched; they are set aside and pushed back with everything else taken.
+        matching_orders = []
+        needed = quantity
+        while book_side and needed > 0 and book_side[0][0] <= limit_key:
+            entry = heapq.heappop(book_side)
+            self._taken_orders.append((book_side, entry))
+            _, _, order_id, available, counterparty_id, is_bot, price = entry
+            if counterparty_id == user_id:
+                continue
+            matching_orders.append((order_id, counterparty_id, available, price, is_bot))
+            needed -= available
         
-        matching_orders = cursor.fetchall()
+        fills, remaining = self._plan_fills(matching_orders, quantity)
         
-        for order_id, seller_id, available, price, is_bot in matching_orders:
-            if remaining <= 0:
-                break
-            
-            # Don't match against own orders
-            if seller_id == user_id:
-                continue
-            
-            fill_qty = min(remaining, available)
-            fill_cost = fill_qty * price
-            
-            # Update the matched order
-            cursor.execute('''
-                UPDATE prediction_orders 
-                SET filled_quantity = filled_quantity + ?
-                WHERE order_id = ?
-            ''', (fill_qty, order_id))
-            
-            # Check if order is fully filled
-            cursor.execute('''
-                UPDATE prediction_orders 
-                SET status = 'filled', filled_at = ?
-                WHERE order_id = ? AND filled_quantity >= quantity
-            ''', (datetime.now().isoformat(), order_id))
-            
-            # Record the trade
-            if direction == 'buy':
-                buyer_id, seller_id_trade = user_id, seller_id
-            else:
-                buyer_id, seller_id_trade = seller_id, user_id
-            
-            cursor.execute('''
-                INSERT INTO prediction_trades 
-                (market_id, buyer_id, seller_id, side, quantity, price, total_amount, executed_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (market_id, buyer_id, seller_id_trade, side, fill_qty, price, fill_cost, 
-                  datetime.now().isoformat()))
-            
-            # Update positions
-            if direction == 'buy':
-                self._update_position(market_id, user_id, side, fill_qty, price, True)
-                self._update_position(market_id, seller_id, side, fill_qty, price, False)
-            else:
-                self._update_position(market_id, user_id, side, fill_qty, price, False)
-                self._update_position(market_id, seller_id, side, fill_qty, price, True)
+        # Apply the planned fills: one prepared statement per kind of write
+        if direction == 'buy':
+            trade_parties = [(user_id, counterparty_id) for _, counterparty_id, _, _, _ in fills]
+        else:
+            trade_parties = [(counterparty_id, user_id) for _, counterparty_id, _, _, _ in fills]
+        
+        # Update the matched orders
+        cursor.executemany(SQL_FILL_ORDER, [
+            (fill_qty, now_iso, order_id) for order_id, _, fill_qty, _, _ in fills
+        ])
+        
+        # Record the trades
+        cursor.executemany(SQL_INSERT_TRADE, [
+            (market_id, buyer_id, seller_id, side, fill_qty, price, fill_qty * price,
+             now_iso, None, None, guild_id)
+            for (buyer_id, seller_id), (_, _, fill_qty, price, _) in zip(trade_parties, fills)
+        ])
+        
+        for order_id, counterparty_id, fill_qty, price, is_bot in fills:
+            # Update positions (in memory; flushed by the caller)
+            self._update_position(market_id, user_id, side, fill_qty, price, direction == 'buy', cursor)
+            self._update_position(market_id, counterparty_id, side, fill_qty, price, direction != 'buy', cursor)
             
             trades.append({
                 'order_id': order_id,
-                'counterparty': seller_id,
+                'counterparty': counterparty_id,
                 'quantity': fill_qty,
                 'price': price,
                 'is_bot': is_bot
             })
             
             filled_quantity += fill_qty
-            total_cost += fill_cost
-            remaining -= fill_qty
+            total_cost += fill_qty * price
         
         # Update market volume
         if filled_quantity > 0:
-            cursor.execute('''
-                UPDATE prediction_markets 
-                SET total_volume = total_volume + ?
-                WHERE market_id = ?
-            ''', (total_cost, market_id))
-        
-        conn.commit()
-        conn.close()
+            cursor.execute(SQL_ADD_MARKET_VOLUME, (total_cost, market_id))
+            self._add_market_volume(market_id, total_cost)
         
         avg_price = total_cost // filled_quantity if filled_quantity > 0 else 0
         
@@ -453,53 +719,182 @@ class PredictionMarketsCog(commands.Cog):
             'trades': trades
         }
     
-    def _create_bot_order(self, market_id: str, side: str, direction: str, quantity: int, price: int):
-        """Create a bot counterparty order for instant fills."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _return_taken_orders(self, filled_by_order: Optional[Dict[int, int]] = None):
+        """
+        Push the orders _match_order popped back onto their heaps once its transaction ends.
+        After a commit pass the filled quantity per order_id; fully filled orders drop out.
+        """
+        filled_by_order = filled_by_order or {}
+        for book_side, entry in self._taken_orders:
+            entry[3] -= filled_by_order.get(entry[2], 0)
+            if entry[3] > 0:
+                heapq.heappush(book_side, entry)
+        self._taken_orders.clear()
+    
+    def _execute_trade(self, market_id: str, guild_id: int, user_id: int, side: str, direction: str,
+                       quantity: int, limit_price: int) -> Tuple[Optional[str], Optional[Dict]]:
+        """
+        Check a trade against market status and position limits, then execute it in one transaction:
+        matching, the bot fill for any remainder and the new market price.
+        Returns (error, None) if the trade can't be placed, otherwise (None, result).
+        """
+        cursor = self._conn.cursor()
+        # Every fill in this trade shares one timestamp
+        now_iso = datetime.now().isoformat()
+        
+        # Market and share-limit checks read the caches, which only this thread writes, so nothing
+        # can change them before the fill below; a rejected trade never takes the write lock
+        market = self._get_market(market_id)
+        if not market or market['guild_id'] != guild_id:
+            return f"Market `{market_id}` not found.", None
+        if market['status'] != 'active':
+            return f"Market `{market_id}` is not active.", None
         
-        cursor.execute('''
-            INSERT INTO prediction_orders 
-            (market_id, user_id, side, direction, quantity, price, status, created_at, is_bot_order)
-            VALUES (?, 0, ?, ?, ?, ?, 'open', ?, 1)
-        ''', (market_id, side, direction, quantity, price, datetime.now().isoformat()))
+        position = self._get_user_position(market_id, user_id)
+        current_shares = position['yes_shares'] if side == 'Yes' else position['no_shares']
+        
+        if direction == 'buy' and current_shares + quantity > MAX_SHARES_PER_USER_PER_MARKET:
+            return (f"Volume cap exceeded. Max {MAX_SHARES_PER_USER_PER_MARKET} shares per user per market.\n"
+                    f"You have {current_shares} {side} shares."), None
+        if direction == 'sell' and quantity > current_shares:
+            return f"Insufficient shares. You have {current_shares} {side} shares.", None
+        
+        # Take the write lock up front so the fills and price update commit once
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            # Try to match against existing orders
+            match_result = self._match_order(
+                cursor, market_id, guild_id, user_id, side, direction, quantity, limit_price, now_iso
+            )
+            
+            # If not fully filled, bot fills the rest (guaranteed clear)
+            bot_fill = None
+            if match_result['remaining'] > 0:
+                bot_fill = self._fill_with_bot(
+                    cursor, market_id, guild_id, user_id, side, direction,
+                    match_result['remaining'], limit_price, now_iso
+                )
+            
+            new_price = self._update_market_price(market_id, cursor)
+            
+            self._flush_positions(cursor)
+        except Exception:
+            self._conn.rollback()
+            self._discard_dirty_positions()
+            self._return_taken_orders()
+            # Volume and price may have been applied to the cached row; reload it instead
+            self._market_meta.pop(market_id, None)
+            raise
+        
+        self._conn.commit()
+        self._return_taken_orders({trade['order_id']: trade['quantity'] for trade in match_result['trades']})
+        self._nfc_status_cache.pop(guild_id, None)
+        if match_result['filled_quantity'] > 0:
+            self._book_views.pop(market_id, None)
+        
+        return None, {
+            'question': market['question'],
+            'previous_price': market['yes_price'],
+            'new_price': new_price,
+            'match': match_result,
+            'bot_fill': bot_fill,
+            'position': self._get_user_position(market_id, user_id)
+        }
+    
+    def _create_market(self, market_id: str, guild_id: int, question: str, created_by: int,
+                       resolution_week: Optional[int], initial_odds: int, channel_id: int):
+        """Insert a new market and seed its bot liquidity in a single transaction."""
+        cursor = self._conn.cursor()
+        
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            cursor.execute('''
+                INSERT INTO prediction_markets 
+                (market_id, guild_id, question, created_by, created_at, resolution_week, yes_price, channel_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (market_id, guild_id, question, created_by,
+                  datetime.now().isoformat(), resolution_week, initial_odds, channel_id))
+            
+            self._seed_bot_liquidity(market_id, initial_odds, cursor)
+        except Exception:
+            self._conn.rollback()
+            raise
         
-        conn.commit()
-        conn.close()
+        self._conn.commit()
     
-    def _seed_bot_liquidity(self, market_id: str, initial_price: int = 50):
-        """Seed initial bot liquidity for a new market."""
+    def _cancel_order(self, order_id: int, user_id: int) -> Optional[tuple]:
+        """Cancel a user's open order and take it off the book; returns None if it isn't open."""
+        order = self._fetch_one('''
+            SELECT market_id, side, direction, quantity, filled_quantity, price
+            FROM prediction_orders
+            WHERE order_id = ? AND user_id = ? AND status = 'open'
+        ''', (order_id, user_id))
+        
+        if not order:
+            return None
+        
+        self._execute('''
+            UPDATE prediction_orders SET status = 'cancelled' WHERE order_id = ?
+        ''', (order_id,))
+        
+        book = self._books.get(order[0])
+        if book is not None:
+            book_side = book[(order[1], order[2])]
+            book_side[:] = [entry for entry in book_side if entry[2] != order_id]
+            heapq.heapify(book_side)
+        self._book_views.pop(order[0], None)
+        
+        return order
+    
+    def _seed_bot_liquidity(self, market_id: str, initial_price: int = 50,
+                            cursor: Optional[sqlite3.Cursor] = None):
+        """Seed initial bot liquidity for a new market; a passed cursor leaves committing to the caller."""
         # Bot provides liquidity on both sides
         # Yes side: sell at initial_price + spread, buy at initial_price - spread
         # No side: sell at (100 - initial_price) + spread, buy at (100 - initial_price) - spread
         
         spread = 5  # 5 cent spread
+        no_price = 100 - initial_price  # No price = 100 - Yes price
+        created_at = datetime.now().isoformat()
+        
+        bot_orders = [
+            # Yes liquidity
+            ('Yes', 'sell', min(initial_price + spread, MAX_PRICE)),
+            ('Yes', 'buy', max(initial_price - spread, MIN_PRICE)),
+            # No liquidity
+            ('No', 'sell', min(no_price + spread, MAX_PRICE)),
+            ('No', 'buy', max(no_price - spread, MIN_PRICE)),
+        ]
         
-        # Yes liquidity
-        self._create_bot_order(market_id, 'Yes', 'sell', BOT_LIQUIDITY_SEED, min(initial_price + spread, MAX_PRICE))
-        self._create_bot_order(market_id, 'Yes', 'buy', BOT_LIQUIDITY_SEED, max(initial_price - spread, MIN_PRICE))
+        own_transaction = cursor is None
+        if own_transaction:
+            cursor = self._conn.cursor()
         
-        # No liquidity (No price = 100 - Yes price)
-        no_price = 100 - initial_price
-        self._create_bot_order(market_id, 'No', 'sell', BOT_LIQUIDITY_SEED, min(no_price + spread, MAX_PRICE))
-        self._create_bot_order(market_id, 'No', 'buy', BOT_LIQUIDITY_SEED, max(no_price - spread, MIN_PRICE))
-    
-    def _fill_with_bot(self, market_id: str, user_id: int, side: str, direction: str, 
-                       quantity: int, price: int) -> Dict:
-        """Fill remaining order quantity with bot counterparty."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor.executemany('''
+            INSERT INTO prediction_orders 
+            (market_id, user_id, side, direction, quantity, price, status, created_at, is_bot_order)
+            VALUES (?, 0, ?, ?, ?, ?, 'open', ?, 1)
+        ''', [
+            (market_id, side, direction, BOT_LIQUIDITY_SEED, price, created_at)
+            for side, direction, price in bot_orders
+        ])
         
+        if own_transaction:
+            self._conn.commit()
+        
+        # A loaded book picks the new orders up when it is next loaded
+        self._books.pop(market_id, None)
+        self._book_views.pop(market_id, None)
+    
+    def _fill_with_bot(self, cursor: sqlite3.Cursor, market_id: str, guild_id: int, user_id: int, side: str,
+                       direction: str, quantity: int, price: int, now_iso: str) -> Dict:
+        """Fill remaining order quantity with bot counterparty inside the caller's transaction."""
         # Bot takes the opposite side
         bot_direction = 'sell' if direction == 'buy' else 'buy'
         
         # Create bot order and immediately fill it
-        cursor.execute('''
-            INSERT INTO prediction_orders 
-            (market_id, user_id, side, direction, quantity, price, filled_quantity, status, created_at, filled_at, is_bot_order)
-            VALUES (?, 0, ?, ?, ?, ?, ?, 'filled', ?, ?, 1)
-        ''', (market_id, side, bot_direction, quantity, price, quantity, 
-              datetime.now().isoformat(), datetime.now().isoformat()))
+        cursor.execute(SQL_INSERT_FILLED_BOT_ORDER, (market_id, side, bot_direction, quantity, price, quantity, 
+              now_iso, now_iso))
         
         bot_order_id = cursor.lastrowid
         
@@ -511,25 +906,15 @@ class PredictionMarketsCog(commands.Cog):
         
         total_amount = quantity * price
         
-        cursor.execute('''
-            INSERT INTO prediction_trades 
-            (market_id, buyer_id, seller_id, side, quantity, price, total_amount, executed_at, buyer_order_id, seller_order_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (market_id, buyer_id, seller_id, side, quantity, price, total_amount,
-              datetime.now().isoformat(), None, bot_order_id))
+        cursor.execute(SQL_INSERT_TRADE, (market_id, buyer_id, seller_id, side, quantity, price, total_amount,
+              now_iso, None, bot_order_id, guild_id))
         
-        # Update user position
-        self._update_position(market_id, user_id, side, quantity, price, direction == 'buy')
+        # Update user position (in memory; flushed by the caller)
+        self._update_position(market_id, user_id, side, quantity, price, direction == 'buy', cursor)
         
         # Update market volume
-        cursor.execute('''
-            UPDATE prediction_markets 
-            SET total_volume = total_volume + ?
-            WHERE market_id = ?
-        ''', (total_amount, market_id))
-        
-        conn.commit()
-        conn.close()
+        cursor.execute(SQL_ADD_MARKET_VOLUME, (total_amount, market_id))
+        self._add_market_volume(market_id, total_amount)
         
         return {
             'filled_quantity': quantity,
@@ -538,33 +923,34 @@ class PredictionMarketsCog(commands.Cog):
             'is_bot_fill': True
         }
     
-    def _update_market_price(self, market_id: str):
-        """Update market price based on recent trades."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _update_market_price(self, market_id: str, cursor: Optional[sqlite3.Cursor] = None) -> int:
+        """
+        Update market price based on recent trades and return the market's Yes price.
+        A passed cursor leaves committing to the caller.
+        """
+        own_transaction = cursor is None
+        if own_transaction:
+            cursor = self._conn.cursor()
         
-        # Get recent Yes trades (last 10)
-        cursor.execute('''
-            SELECT price, quantity FROM prediction_trades
-            WHERE market_id = ? AND side = 'Yes'
-            ORDER BY executed_at DESC
-            LIMIT 10
-        ''', (market_id,))
-        trades = cursor.fetchall()
-        
-        if trades:
-            # Volume-weighted average price
-            total_value = sum(p * q for p, q in trades)
-            total_quantity = sum(q for _, q in trades)
-            new_price = total_value // total_quantity if total_quantity > 0 else 50
-            new_price = max(MIN_PRICE, min(MAX_PRICE, new_price))
-            
-            cursor.execute('''
-                UPDATE prediction_markets SET yes_price = ? WHERE market_id = ?
-            ''', (new_price, market_id))
+        # Value and volume of the recent Yes trades (last 10), summed in SQL
+        cursor.execute(SQL_RECENT_YES_TRADES, (market_id,))
+        trade_count, total_value, total_quantity = cursor.fetchone()
+        
+        if not trade_count:
+            return self._get_market(market_id)['yes_price']
+        
+        # Volume-weighted average price
+        new_price = total_value // total_quantity if total_quantity > 0 else 50
+        new_price = max(MIN_PRICE, min(MAX_PRICE, new_price))
+        
+        cursor.execute(SQL_SET_YES_PRICE, (new_price, market_id))
+        if own_transaction:
+            self._conn.commit()
         
-        conn.commit()
-        conn.close()
+        if market_id in self._market_meta:
+            self._market_meta[market_id]['yes_price'] = new_price
+        
+        return new_price
     
     def _calculate_user_pnl(self, market_id: str, user_id: int, current_yes_price: int) -> Dict:
         """Calculate unrealized P/L for a user's position."""
@@ -584,20 +970,183 @@ class PredictionMarketsCog(commands.Cog):
             'unrealized_pnl': unrealized_pnl
         }
     
-    async def _get_snallabot_config(self, guild_id: int) -> Optional[Dict]:
-        """Get Snallabot configuration."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT league_id, platform, current_season FROM league_config 
-            WHERE guild_id = ? AND is_active = 1
-        ''', (guild_id,))
-        row = cursor.fetchone()
-        conn.close()
+    def _calculate_portfolio_pnl(self, user_id: int, guild_id: int) -> List[tuple]:
+        """Calculate value and unrealized P/L for all of a user's held positions in one query."""
+        return self._fetch_all('''
+            SELECT p.market_id, p.yes_shares, p.no_shares, p.total_invested,
+                   m.question, m.yes_price, m.status,
+                   p.yes_shares * m.yes_price + p.no_shares * (100 - m.yes_price) AS current_value,
+                   p.yes_shares * m.yes_price + p.no_shares * (100 - m.yes_price) - p.total_invested AS unrealized_pnl
+            FROM prediction_positions p
+            JOIN prediction_markets m ON p.market_id = m.market_id
+            WHERE p.user_id = ? AND m.guild_id = ?
+            AND (p.yes_shares > 0 OR p.no_shares > 0)
+        ''', (user_id, guild_id))
+    
+    def _settle_market(self, market_id: str, guild_id: int,
+                       result: str) -> Optional[Tuple[List[Dict], List[Dict], List[Dict]]]:
+        """
+        Settle a market in one transaction: lifetime stats, P2P payments and the resolved status.
+        Returns (winners, losers, payments_created), or None if the market was no longer active.
+        """
+        cursor = self._conn.cursor()
         
-        if row:
-            return {'league_id': row[0], 'platform': row[1], 'current_season': row[2]}
-        return None
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            # Mark market as resolved; claiming it first means a market is only ever settled once
+            cursor.execute('''
+                UPDATE prediction_markets 
+                SET status = 'resolved', result = ?, resolved_at = ?
+                WHERE market_id = ? AND status = 'active'
+            ''', (result, datetime.now().isoformat(), market_id))
+            
+            if cursor.rowcount == 0:
+                self._conn.rollback()
+                return None
+            
+            # Settle every position (excluding bot) in SQL: winning shares pay out $1 each
+            # (100 cents), and each user's lifetime stats take the profit (no house fee)
+            cursor.execute('''
+                INSERT INTO prediction_profits (user_id, total_profit, total_volume, markets_won, markets_lost, markets_participated)
+                SELECT user_id, payout - invested, invested, payout > invested, payout < invested, 1
+                FROM (
+                    SELECT user_id, total_invested AS invested,
+                           CASE ?2 WHEN 'Yes' THEN yes_shares ELSE no_shares END * 100 AS payout
+                    FROM prediction_positions
+                    WHERE market_id = ?1 AND user_id != 0
+                )
+                WHERE true
+                ON CONFLICT(user_id) DO UPDATE SET
+                    total_profit = total_profit + excluded.total_profit,
+                    total_volume = total_volume + excluded.total_volume,
+                    markets_won = markets_won + excluded.markets_won,
+                    markets_lost = markets_lost + excluded.markets_lost,
+                    markets_participated = markets_participated + 1
+            ''', (market_id, result))
+            
+            # Separate winners and losers
+            cursor.execute('''
+                SELECT user_id, CASE ?2 WHEN 'Yes' THEN yes_shares ELSE no_shares END * 100 - total_invested, total_invested
+                FROM prediction_positions
+                WHERE market_id = ?1 AND user_id != 0
+            ''', (market_id, result))
+            
+            winners = []
+            losers = []
+            for user_id, profit, invested in cursor.fetchall():
+                if profit > 0:
+                    winners.append({'user_id': user_id, 'profit': profit, 'invested': invested})
+                elif profit < 0:
+                    losers.append({'user_id': user_id, 'loss': abs(profit), 'invested': invested})
+            
+            # Create P2P payment obligations - match losers to winners proportionally
+            payments_created = []
+            total_winnings = sum(w['profit'] for w in winners)
+            
+            if winners and losers and total_winnings > 0:
+                for loser in losers:
+                    for winner in winners:
+                        # Calculate proportional payment based on winner's share of total winnings
+                        winner_share = winner['profit'] / total_winnings
+                        payment_amount = int(loser['loss'] * winner_share)
+                        
+                        if payment_amount >= 100:  # At least $1 (100 cents)
+                            # Convert cents to dollars for storage
+                            payments_created.append({
+                                'winner_id': winner['user_id'],
+                                'loser_id': loser['user_id'],
+                                'amount': payment_amount // 100
+                            })
+            
+            created_at = datetime.now().isoformat()
+            cursor.executemany('''
+                INSERT INTO prediction_payments 
+                (market_id, guild_id, winner_id, loser_id, amount, is_paid, created_at)
+                VALUES (?, ?, ?, ?, ?, 0, ?)
+            ''', [
+                (market_id, guild_id, p['winner_id'], p['loser_id'], p['amount'], created_at)
+                for p in payments_created
+            ])
+        except Exception:
+            self._conn.rollback()
+            raise
+        
+        self._conn.commit()
+        self._forget_market(market_id)
+        self._nfc_status_cache.pop(guild_id, None)
+        
+        return winners, losers, payments_created
+    
+    def _get_market_status(self, market_id: str, guild_id: int,
+                           user_id: int) -> Optional[Tuple[Dict, List[tuple], Dict, Dict]]:
+        """
+        Get a market with its recent trades, order book and the user's P/L in one trip to the
+        database thread; returns None if the market isn't in this guild.
+        """
+        market = self._get_market(market_id)
+        if not market or market['guild_id'] != guild_id:
+            return None
+        
+        # Get recent trades
+        recent_trades = self._fetch_all('''
+            SELECT side, quantity, price, strftime('%m/%d %H:%M', executed_at), buyer_id, seller_id
+            FROM prediction_trades
+            WHERE market_id = ?
+            ORDER BY executed_at DESC, trade_id DESC
+            LIMIT 5
+        ''', (market_id,))
+        
+        order_book = self._get_order_book(market_id)
+        pnl = self._calculate_user_pnl(market_id, user_id, market['yes_price'])
+        
+        return market, recent_trades, order_book, pnl
+    
+    def _get_user_portfolio(self, user_id: int, guild_id: int) -> Tuple[List[tuple], List[tuple], Optional[tuple]]:
+        """Get a user's valued positions, open orders and lifetime profits in one trip to the database thread."""
+        # Get all positions, valued at current prices
+        positions = self._calculate_portfolio_pnl(user_id, guild_id)
+        
+        # Get open orders
+        open_orders = self._fetch_all('''
+            SELECT o.order_id, o.market_id, o.side, o.direction, 
+                   o.quantity - o.filled_quantity as remaining, o.price
+            FROM prediction_orders o
+            JOIN prediction_markets m ON o.market_id = m.market_id
+            WHERE o.user_id = ? AND o.status = 'open' AND m.guild_id = ?
+            AND o.quantity > o.filled_quantity
+        ''', (user_id, guild_id))
+        
+        # Get lifetime profits
+        profits = self._fetch_one('''
+            SELECT total_profit, total_volume, markets_won, markets_lost
+            FROM prediction_profits
+            WHERE user_id = ?
+        ''', (user_id,))
+        
+        return positions, open_orders, profits
+    
+    async def _get_snallabot_config(self, guild_id: int) -> Optional[Dict]:
+        """Get Snallabot configuration, cached per guild once found."""
+        config = self._snalla_cache.get(guild_id)
+        if config is None:
+            row = await self._run_db(self._fetch_one, '''
+                SELECT league_id, platform, current_season FROM league_config 
+                WHERE guild_id = ? AND is_active = 1
+            ''', (guild_id,))
+            
+            # Missing configs aren't cached so a league set up later is picked up
+            if not row:
+                return None
+            config = {'league_id': row[0], 'platform': row[1], 'current_season': row[2]}
+            self._snalla_cache[guild_id] = config
+        return dict(config)
+    
+    def invalidate_snalla(self, guild_id: Optional[int] = None):
+        """Drop cached Snallabot config for a guild (or all guilds) after league_config changes."""
+        if guild_id is None:
+            self._snalla_cache.clear()
+        else:
+            self._snalla_cache.pop(guild_id, None)
     
     # ==================== COMMAND GROUP ====================
     
@@ -622,27 +1171,17 @@ class PredictionMarketsCog(commands.Cog):
         # Validate initial odds
         initial_odds = max(MIN_PRICE, min(MAX_PRICE, initial_odds))
         
-        market_id = self._generate_market_id()
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        market_id = await self._run_db(self._generate_market_id)
         
         # Find or create prediction-markets channel
-        channel = discord.utils.get(interaction.guild.text_channels, name='prediction-markets')
+        channel = self._find_channel(interaction.guild, 'prediction-markets')
         channel_id = channel.id if channel else interaction.channel.id
         
-        cursor.execute('''
-            INSERT INTO prediction_markets 
-            (market_id, guild_id, question, created_by, created_at, resolution_week, yes_price, channel_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (market_id, interaction.guild.id, question, interaction.user.id,
-              datetime.now().isoformat(), resolution_week, initial_odds, channel_id))
-        
-        conn.commit()
-        conn.close()
-        
-        # Seed bot liquidity
-        self._seed_bot_liquidity(market_id, initial_odds)
+        # Create the market with its seeded bot liquidity
+        await self._run_db(
+            self._create_market, market_id, interaction.guild.id, question, interaction.user.id,
+            resolution_week, initial_odds, channel_id
+        )
         
         # Create embed
         embed = discord.Embed(
@@ -690,18 +1229,15 @@ class PredictionMarketsCog(commands.Cog):
         """List all active markets with current odds."""
         await interaction.response.defer()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT market_id, question, yes_price, total_volume, resolution_week, created_by
-            FROM prediction_markets
-            WHERE guild_id = ? AND status = 'active'
-            ORDER BY created_at DESC
-        ''', (interaction.guild.id,))
-        
-        markets = cursor.fetchall()
-        conn.close()
+        # Active markets with the caller's position on each, in one query
+        markets = await self._run_db(self._fetch_all, '''
+            SELECT m.market_id, m.question, m.yes_price, m.total_volume, m.resolution_week, m.created_by,
+                   COALESCE(p.yes_shares, 0), COALESCE(p.no_shares, 0)
+            FROM prediction_markets m
+            LEFT JOIN prediction_positions p ON p.market_id = m.market_id AND p.user_id = ?
+            WHERE m.guild_id = ? AND m.status = 'active'
+            ORDER BY m.created_at DESC
+        ''', (interaction.user.id, interaction.guild.id))
         
         if not markets:
             await interaction.followup.send("📭 No active prediction markets. Create one with `/market create`!")
@@ -713,12 +1249,10 @@ class PredictionMarketsCog(commands.Cog):
             timestamp=datetime.now()
         )
         
-        for market_id, question, yes_price, volume, res_week, creator_id in markets:
-            # Get user's position
-            position = self._get_user_position(market_id, interaction.user.id)
+        for market_id, question, yes_price, volume, res_week, creator_id, yes_shares, no_shares in markets:
             pos_str = ""
-            if position['yes_shares'] > 0 or position['no_shares'] > 0:
-                pos_str = f"\n📍 Your position: {position['yes_shares']} Yes, {position['no_shares']} No"
+            if yes_shares > 0 or no_shares > 0:
+                pos_str = f"\n📍 Your position: {yes_shares} Yes, {no_shares} No"
             
             res_str = f"Week {res_week}" if res_week else "Manual"
             
@@ -739,36 +1273,20 @@ class PredictionMarketsCog(commands.Cog):
         """View detailed market status including order book."""
         await interaction.response.defer()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT question, yes_price, total_volume, resolution_week, status, created_by, created_at
-            FROM prediction_markets
-            WHERE market_id = ? AND guild_id = ?
-        ''', (market_id.upper(), interaction.guild.id))
-        
-        market = cursor.fetchone()
+        status_data = await self._run_db(
+            self._get_market_status, market_id.upper(), interaction.guild.id, interaction.user.id
+        )
         
-        if not market:
+        if not status_data:
             await interaction.followup.send(f"❌ Market `{market_id}` not found.", ephemeral=True)
             return
         
-        question, yes_price, volume, res_week, status, creator_id, created_at = market
-        
-        # Get recent trades
-        cursor.execute('''
-            SELECT side, quantity, price, executed_at, buyer_id, seller_id
-            FROM prediction_trades
-            WHERE market_id = ?
-            ORDER BY executed_at DESC
-            LIMIT 5
-        ''', (market_id.upper(),))
-        recent_trades = cursor.fetchall()
-        conn.close()
-        
-        # Get order book
-        order_book = self._get_order_book(market_id.upper())
+        market, recent_trades, order_book, pnl = status_data
+        question = market['question']
+        yes_price = market['yes_price']
+        volume = market['total_volume']
+        res_week = market['resolution_week']
+        status = market['status']
         
         embed = discord.Embed(
             title=f"📊 Market Status: {market_id.upper()}",
@@ -809,14 +1327,13 @@ class PredictionMarketsCog(commands.Cog):
         
         # Recent trades
         if recent_trades:
-            trades_str = ""
-            for side, qty, price, exec_at, buyer, seller in recent_trades[:5]:
-                time_str = datetime.fromisoformat(exec_at).strftime("%m/%d %H:%M")
-                trades_str += f"• {side} ${qty} @ {price}¢ ({time_str})\n"
-            embed.add_field(name="🔄 Recent Trades", value=trades_str, inline=False)
+            trades = [
+                f"• {side} ${qty} @ {price}¢ ({time_str})"
+                for side, qty, price, time_str, buyer, seller in recent_trades[:5]
+            ]
+            embed.add_field(name="🔄 Recent Trades", value="\n".join(trades), inline=False)
         
         # User's position
-        pnl = self._calculate_user_pnl(market_id.upper(), interaction.user.id, yes_price)
         if pnl['yes_shares'] > 0 or pnl['no_shares'] > 0:
             pnl_color = "🟢" if pnl['unrealized_pnl'] >= 0 else "🔴"
             embed.add_field(
@@ -872,73 +1389,27 @@ class PredictionMarketsCog(commands.Cog):
             await interaction.followup.send(f"❌ Price must be between {MIN_PRICE}¢ and {MAX_PRICE}¢", ephemeral=True)
             return
         
-        # Check market exists and is active
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT status, yes_price, question FROM prediction_markets
-            WHERE market_id = ? AND guild_id = ?
-        ''', (market_id, interaction.guild.id))
-        
-        market = cursor.fetchone()
-        
-        if not market:
-            await interaction.followup.send(f"❌ Market `{market_id}` not found.", ephemeral=True)
-            conn.close()
-            return
-        
-        if market[0] != 'active':
-            await interaction.followup.send(f"❌ Market `{market_id}` is not active.", ephemeral=True)
-            conn.close()
-            return
-        
-        current_price = market[1]
-        question = market[2]
-        
-        # Check user's current position for volume cap
-        position = self._get_user_position(market_id, interaction.user.id)
-        current_shares = position['yes_shares'] if side == 'Yes' else position['no_shares']
-        
         # Calculate quantity (shares) from dollar amount
         quantity = amount  # In this system, $1 = 1 share at the limit price
         
-        if direction == 'buy' and current_shares + quantity > MAX_SHARES_PER_USER_PER_MARKET:
-            await interaction.followup.send(
-                f"❌ Volume cap exceeded. Max {MAX_SHARES_PER_USER_PER_MARKET} shares per user per market.\n"
-                f"You have {current_shares} {side} shares.",
-                ephemeral=True
-            )
-            conn.close()
-            return
+        # Market and position checks, matching, bot fill and price update run as one transaction
+        error, result = await self._run_db(
+            self._execute_trade, market_id, interaction.guild.id, interaction.user.id,
+            side, direction, quantity, limit_price
+        )
         
-        if direction == 'sell' and quantity > current_shares:
-            await interaction.followup.send(
-                f"❌ Insufficient shares. You have {current_shares} {side} shares.",
-                ephemeral=True
-            )
-            conn.close()
+        if error:
+            await interaction.followup.send(f"❌ {error}", ephemeral=True)
             return
         
-        conn.close()
-        
-        # Try to match against existing orders
-        match_result = self._match_order(market_id, interaction.user.id, side, direction, quantity, limit_price)
-        
-        filled = match_result['filled_quantity']
-        remaining = match_result['remaining']
+        question = result['question']
+        current_price = result['previous_price']
+        new_price = result['new_price']
+        match_result = result['match']
+        bot_fill = result['bot_fill']
+        new_position = result['position']
         
-        # If not fully filled, bot fills the rest (guaranteed clear)
-        bot_fill = None
-        if remaining > 0:
-            bot_fill = self._fill_with_bot(market_id, interaction.user.id, side, direction, remaining, limit_price)
-            filled += bot_fill['filled_quantity']
-        
-        # Update market price
-        self._update_market_price(market_id)
-        
-        # Get updated position
-        new_position = self._get_user_position(market_id, interaction.user.id)
+        filled = match_result['filled_quantity'] + (bot_fill['filled_quantity'] if bot_fill else 0)
         
         # Create response embed
         embed = discord.Embed(
@@ -967,12 +1438,6 @@ class PredictionMarketsCog(commands.Cog):
         )
         
         # Check for big price move
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT yes_price FROM prediction_markets WHERE market_id = ?', (market_id,))
-        new_price = cursor.fetchone()[0]
-        conn.close()
-        
         price_change = new_price - current_price
         if abs(price_change) >= 10:
             embed.add_field(
@@ -982,7 +1447,7 @@ class PredictionMarketsCog(commands.Cog):
             )
             
             # Announce in channel
-            channel = discord.utils.get(interaction.guild.text_channels, name='prediction-markets')
+            channel = self._find_channel(interaction.guild, 'prediction-markets')
             if channel:
                 alert_embed = discord.Embed(
                     title=f"🚨 Big Move in {market_id}!",
@@ -999,32 +1464,15 @@ class PredictionMarketsCog(commands.Cog):
     @app_commands.describe(order_id="The order ID to cancel")
     async def cancel_order(self, interaction: discord.Interaction, order_id: int):
         """Cancel an open order."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT market_id, side, direction, quantity, filled_quantity, price
-            FROM prediction_orders
-            WHERE order_id = ? AND user_id = ? AND status = 'open'
-        ''', (order_id, interaction.user.id))
-        
-        order = cursor.fetchone()
+        order = await self._run_db(self._cancel_order, order_id, interaction.user.id)
         
         if not order:
             await interaction.response.send_message(
                 "❌ Order not found or already filled/cancelled.",
                 ephemeral=True
             )
-            conn.close()
             return
         
-        cursor.execute('''
-            UPDATE prediction_orders SET status = 'cancelled' WHERE order_id = ?
-        ''', (order_id,))
-        
-        conn.commit()
-        conn.close()
-        
         market_id, side, direction, qty, filled, price = order
         remaining = qty - filled
         
@@ -1040,42 +1488,9 @@ class PredictionMarketsCog(commands.Cog):
         """View all your positions and unrealized P/L."""
         await interaction.response.defer()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get all positions
-        cursor.execute('''
-            SELECT p.market_id, p.yes_shares, p.no_shares, p.total_invested,
-                   m.question, m.yes_price, m.status
-            FROM prediction_positions p
-            JOIN prediction_markets m ON p.market_id = m.market_id
-            WHERE p.user_id = ? AND m.guild_id = ?
-            AND (p.yes_shares > 0 OR p.no_shares > 0)
-        ''', (interaction.user.id, interaction.guild.id))
-        
-        positions = cursor.fetchall()
-        
-        # Get open orders
-        cursor.execute('''
-            SELECT o.order_id, o.market_id, o.side, o.direction, 
-                   o.quantity - o.filled_quantity as remaining, o.price
-            FROM prediction_orders o
-            JOIN prediction_markets m ON o.market_id = m.market_id
-            WHERE o.user_id = ? AND o.status = 'open' AND m.guild_id = ?
-            AND o.quantity > o.filled_quantity
-        ''', (interaction.user.id, interaction.guild.id))
-        
-        open_orders = cursor.fetchall()
-        
-        # Get lifetime profits
-        cursor.execute('''
-            SELECT total_profit, total_volume, markets_won, markets_lost
-            FROM prediction_profits
-            WHERE user_id = ?
-        ''', (interaction.user.id,))
-        
-        profits = cursor.fetchone()
-        conn.close()
+        positions, open_orders, profits = await self._run_db(
+            self._get_user_portfolio, interaction.user.id, interaction.guild.id
+        )
         
         embed = discord.Embed(
             title=f"📊 {interaction.user.display_name}'s Positions",
@@ -1088,12 +1503,7 @@ class PredictionMarketsCog(commands.Cog):
         total_unrealized = 0
         
         if positions:
-            for market_id, yes_shares, no_shares, invested, question, yes_price, status in positions:
-                yes_value = yes_shares * yes_price
-                no_value = no_shares * (100 - yes_price)
-                current_value = yes_value + no_value
-                unrealized = current_value - invested
-                
+            for market_id, yes_shares, no_shares, invested, question, yes_price, status, current_value, unrealized in positions:
                 total_invested += invested
                 total_value += current_value
                 total_unrealized += unrealized
@@ -1113,10 +1523,11 @@ class PredictionMarketsCog(commands.Cog):
         
         # Open orders
         if open_orders:
-            orders_str = ""
-            for order_id, market_id, side, direction, remaining, price in open_orders:
-                orders_str += f"• #{order_id}: {market_id} {direction.title()} {side} ${remaining} @ {price}¢\n"
-            embed.add_field(name="📋 Open Orders", value=orders_str[:1024], inline=False)
+            orders = (
+                f"• #{order_id}: {market_id} {direction.title()} {side} ${remaining} @ {price}¢"
+                for order_id, market_id, side, direction, remaining, price in open_orders
+            )
+            embed.add_field(name="📋 Open Orders", value=self._join_field(orders), inline=False)
         
         # Summary
         pnl_emoji = "🟢" if total_unrealized >= 0 else "🔴"
@@ -1148,19 +1559,13 @@ class PredictionMarketsCog(commands.Cog):
         """View league rankings by net profits."""
         await interaction.response.defer()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        rankings = await self._run_db(self._fetch_all, '''
             SELECT user_id, total_profit, total_volume, markets_won, markets_lost
             FROM prediction_profits
             ORDER BY total_profit DESC
             LIMIT 15
         ''')
         
-        rankings = cursor.fetchall()
-        conn.close()
-        
         embed = discord.Embed(
             title="🏆 Prediction Market Leaderboard",
             color=discord.Color.gold(),
@@ -1170,19 +1575,19 @@ class PredictionMarketsCog(commands.Cog):
         if not rankings:
             embed.description = "No settled markets yet. Start trading!"
         else:
-            leaderboard_str = ""
+            names = self._display_names(interaction.guild, [row[0] for row in rankings])
+            leaderboard = []
             for i, (user_id, profit, volume, won, lost) in enumerate(rankings, 1):
-                member = interaction.guild.get_member(user_id)
-                name = member.display_name if member else f"User {user_id}"
+                name = names[user_id]
                 
                 win_rate = (won / (won + lost) * 100) if (won + lost) > 0 else 0
                 profit_emoji = "🟢" if profit >= 0 else "🔴"
                 
                 medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"#{i}"
                 
-                leaderboard_str += f"{medal} **{name}** {profit_emoji} ${profit:+,} ({win_rate:.0f}% win rate)\n"
+                leaderboard.append(f"{medal} **{name}** {profit_emoji} ${profit:+,} ({win_rate:.0f}% win rate)")
             
-            embed.description = leaderboard_str
+            embed.description = "\n".join(leaderboard)
         
         embed.set_footer(text="Rankings based on settled market profits")
         
@@ -1206,107 +1611,28 @@ class PredictionMarketsCog(commands.Cog):
         
         market_id = market_id.upper()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         # Check market exists and is active
-        cursor.execute('''
+        market = await self._run_db(self._fetch_one, '''
             SELECT question, status, channel_id FROM prediction_markets
             WHERE market_id = ? AND guild_id = ?
         ''', (market_id, interaction.guild.id))
         
-        market = cursor.fetchone()
-        
         if not market:
             await interaction.followup.send(f"❌ Market `{market_id}` not found.", ephemeral=True)
-            conn.close()
             return
         
         if market[1] != 'active':
             await interaction.followup.send(f"❌ Market `{market_id}` is already resolved.", ephemeral=True)
-            conn.close()
             return
         
         question, _, channel_id = market
         
-        # Get all positions (excluding bot)
-        cursor.execute('''
-            SELECT user_id, yes_shares, no_shares, total_invested
-            FROM prediction_positions
-            WHERE market_id = ? AND user_id != 0
-        ''', (market_id,))
-        
-        positions = cursor.fetchall()
-        
-        # Separate winners and losers
-        winners = []
-        losers = []
-        
-        for user_id, yes_shares, no_shares, invested in positions:
-            # Winning shares pay out $1 each (100 cents)
-            if result == 'Yes':
-                winning_shares = yes_shares
-            else:
-                winning_shares = no_shares
-            
-            payout = winning_shares * 100
-            profit = payout - invested
-            
-            # Update user's lifetime stats (no house fee)
-            cursor.execute('''
-                INSERT INTO prediction_profits (user_id, total_profit, total_volume, markets_won, markets_lost, markets_participated)
-                VALUES (?, ?, ?, ?, ?, 1)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    total_profit = total_profit + ?,
-                    total_volume = total_volume + ?,
-                    markets_won = markets_won + ?,
-                    markets_lost = markets_lost + ?,
-                    markets_participated = markets_participated + 1
-            ''', (user_id, profit, invested, 1 if profit > 0 else 0, 1 if profit < 0 else 0,
-                  profit, invested, 1 if profit > 0 else 0, 1 if profit < 0 else 0))
-            
-            if profit > 0:
-                winners.append({'user_id': user_id, 'profit': profit, 'invested': invested})
-            elif profit < 0:
-                losers.append({'user_id': user_id, 'loss': abs(profit), 'invested': invested})
-        
-        # Create P2P payment obligations - match losers to winners proportionally
-        payments_created = []
-        total_winnings = sum(w['profit'] for w in winners)
-        
-        if winners and losers and total_winnings > 0:
-            for loser in losers:
-                for winner in winners:
-                    # Calculate proportional payment based on winner's share of total winnings
-                    winner_share = winner['profit'] / total_winnings
-                    payment_amount = int(loser['loss'] * winner_share)
-                    
-                    if payment_amount >= 100:  # At least $1 (100 cents)
-                        # Convert cents to dollars for storage
-                        payment_dollars = payment_amount // 100
-                        
-                        cursor.execute('''
-                            INSERT INTO prediction_payments 
-                            (market_id, guild_id, winner_id, loser_id, amount, is_paid, created_at)
-                            VALUES (?, ?, ?, ?, ?, 0, ?)
-                        ''', (market_id, interaction.guild.id, winner['user_id'], loser['user_id'], 
-                              payment_dollars, datetime.now().isoformat()))
-                        
-                        payments_created.append({
-                            'winner_id': winner['user_id'],
-                            'loser_id': loser['user_id'],
-                            'amount': payment_dollars
-                        })
-        
-        # Mark market as resolved
-        cursor.execute('''
-            UPDATE prediction_markets 
-            SET status = 'resolved', result = ?, resolved_at = ?
-            WHERE market_id = ?
-        ''', (result, datetime.now().isoformat(), market_id))
+        settlement = await self._run_db(self._settle_market, market_id, interaction.guild.id, result)
+        if settlement is None:
+            await interaction.followup.send(f"❌ Market `{market_id}` is already resolved.", ephemeral=True)
+            return
         
-        conn.commit()
-        conn.close()
+        winners, losers, payments_created = settlement
         
         # Create resolution embed
         embed = discord.Embed(
@@ -1316,36 +1642,37 @@ class PredictionMarketsCog(commands.Cog):
             timestamp=datetime.now()
         )
         
+        # Every name shown below or used in the DMs, looked up once
+        names = self._display_names(
+            interaction.guild,
+            [w['user_id'] for w in winners] + [l['user_id'] for l in losers] +
+            [p['winner_id'] for p in payments_created] + [p['loser_id'] for p in payments_created]
+        )
+        
         # Show winners
         if winners:
-            winners_str = ""
-            for w in sorted(winners, key=lambda x: x['profit'], reverse=True)[:5]:
-                member = interaction.guild.get_member(w['user_id'])
-                name = member.display_name if member else f"User {w['user_id']}"
-                winners_str += f"🟢 **{name}**: +${w['profit'] // 100:,}\n"
-            embed.add_field(name="🏆 Winners", value=winners_str, inline=True)
+            winner_lines = []
+            for w in heapq.nlargest(5, winners, key=itemgetter('profit')):
+                winner_lines.append(f"🟢 **{names[w['user_id']]}**: +${w['profit'] // 100:,}")
+            embed.add_field(name="🏆 Winners", value="\n".join(winner_lines), inline=True)
         
         # Show losers
         if losers:
-            losers_str = ""
-            for l in sorted(losers, key=lambda x: x['loss'], reverse=True)[:5]:
-                member = interaction.guild.get_member(l['user_id'])
-                name = member.display_name if member else f"User {l['user_id']}"
-                losers_str += f"🔴 **{name}**: -${l['loss'] // 100:,}\n"
-            embed.add_field(name="📉 Losers", value=losers_str, inline=True)
+            loser_lines = []
+            for l in heapq.nlargest(5, losers, key=itemgetter('loss')):
+                loser_lines.append(f"🔴 **{names[l['user_id']]}**: -${l['loss'] // 100:,}")
+            embed.add_field(name="📉 Losers", value="\n".join(loser_lines), inline=True)
         
         # Show payment obligations
         if payments_created:
-            payments_str = f"**{len(payments_created)} payment(s) created**\n\n"
-            for p in payments_created[:5]:
-                winner = interaction.guild.get_member(p['winner_id'])
-                loser = interaction.guild.get_member(p['loser_id'])
-                winner_name = winner.display_name if winner else f"User {p['winner_id']}"
-                loser_name = loser.display_name if loser else f"User {p['loser_id']}"
-                payments_str += f"• {loser_name} owes {winner_name} **${p['amount']}**\n"
+            payment_lines = [f"**{len(payments_created)} payment(s) created**\n"]
+            payment_lines.extend(
+                f"• {names[p['loser_id']]} owes {names[p['winner_id']]} **${p['amount']}**"
+                for p in payments_created[:5]
+            )
             if len(payments_created) > 5:
-                payments_str += f"... and {len(payments_created) - 5} more"
-            embed.add_field(name="💸 Payment Obligations", value=payments_str, inline=False)
+                payment_lines.append(f"... and {len(payments_created) - 5} more")
+            embed.add_field(name="💸 Payment Obligations", value="\n".join(payment_lines), inline=False)
         
         embed.add_field(
             name="💰 How to Pay",
@@ -1367,10 +1694,9 @@ class PredictionMarketsCog(commands.Cog):
         # DM losers about their payment obligations
         for p in payments_created:
             loser = interaction.guild.get_member(p['loser_id'])
-            winner = interaction.guild.get_member(p['winner_id'])
             if loser:
                 try:
-                    winner_name = winner.display_name if winner else f"User {p['winner_id']}"
+                    winner_name = names[p['winner_id']]
                     dm_embed = discord.Embed(
                         title="💸 Prediction Market Payment Due",
                         description=f"Market **{market_id}** has been resolved.\n\n"
@@ -1394,35 +1720,40 @@ class PredictionMarketsCog(commands.Cog):
         """Periodically update market odds and check for auto-resolution."""
         logger.info("Running hourly market odds update...")
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get all active markets
-        cursor.execute('''
-            SELECT market_id, guild_id, resolution_week, channel_id
-            FROM prediction_markets
-            WHERE status = 'active'
-        ''')
-        
-        markets = cursor.fetchall()
-        conn.close()
+        await self._run_db(self._refresh_active_markets)
+    
+    def _refresh_active_markets(self):
+        """Reprice every active market and top up thin order books, all in one transaction."""
+        cursor = self._conn.cursor()
+        markets = []
         
-        for market_id, guild_id, res_week, channel_id in markets:
-            # Update price based on recent trades
-            self._update_market_price(market_id)
-            
-            # Refresh bot liquidity if needed
-            order_book = self._get_order_book(market_id)
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            # Get all active markets
+            markets = [row[0] for row in cursor.execute('''
+                SELECT market_id FROM prediction_markets WHERE status = 'active'
+            ''').fetchall()]
             
-            # Add more bot liquidity if order book is thin
-            if len(order_book['yes_bids']) < 2 or len(order_book['yes_asks']) < 2:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute('SELECT yes_price FROM prediction_markets WHERE market_id = ?', (market_id,))
-                current_price = cursor.fetchone()[0]
-                conn.close()
+            for market_id in markets:
+                # Update price based on recent trades
+                current_price = self._update_market_price(market_id, cursor)
                 
-                self._seed_bot_liquidity(market_id, current_price)
+                # Add more bot liquidity if order book is thin
+                book = self._get_book(market_id)
+                if len(book[('Yes', 'buy')]) < 2 or len(book[('Yes', 'sell')]) < 2:
+                    self._seed_bot_liquidity(market_id, current_price, cursor)
+        except Exception:
+            self._conn.rollback()
+            # Cached prices and books may already reflect the rolled-back writes
+            for market_id in markets:
+                self._market_meta.pop(market_id, None)
+                self._books.pop(market_id, None)
+                self._book_views.pop(market_id, None)
+            raise
+        
+        self._conn.commit()
+        # Long-lived connection: let SQLite refresh its planner statistics now and then
+        cursor.execute('PRAGMA optimize')
     
     @update_market_odds.before_loop
     async def before_update_market_odds(self):
@@ -1435,28 +1766,25 @@ class PredictionMarketsCog(commands.Cog):
         """Check if a member is an NFC team owner."""
         for role in member.roles:
             role_name = role.name.upper()
-            for nfc_team in NFC_TEAMS:
-                if nfc_team.upper() in role_name or role_name in nfc_team.upper():
-                    return True
+            if role_name in NFC_TEAM_FRAGMENTS or NFC_TEAM_PATTERN.search(role_name):
+                return True
         return False
     
-    def _get_user_prediction_volume(self, user_id: int, guild_id: int) -> int:
-        """Get total volume a user has traded in prediction markets."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Sum all trades (buys) for this user
-        cursor.execute('''
-            SELECT COALESCE(SUM(t.total_amount), 0)
-            FROM prediction_trades t
-            JOIN prediction_markets m ON t.market_id = m.market_id
-            WHERE (t.buyer_id = ? OR t.seller_id = ?) AND m.guild_id = ?
-        ''', (user_id, user_id, guild_id))
-        
-        volume = cursor.fetchone()[0]
-        conn.close()
+    def _get_guild_prediction_volumes(self, guild_id: int) -> Dict[int, int]:
+        """Get total volume (in dollars) every user has traded in a guild's prediction markets."""
+        # Each trade counts toward both its buyer and its seller
+        rows = self._fetch_all('''
+            SELECT user_id, SUM(total_amount) FROM (
+                SELECT buyer_id AS user_id, total_amount FROM prediction_trades
+                WHERE guild_id = ?1
+                UNION ALL
+                SELECT seller_id, total_amount FROM prediction_trades
+                WHERE guild_id = ?1 AND seller_id != buyer_id
+            )
+            GROUP BY user_id
+        ''', (guild_id,))
         
-        return volume // 100  # Convert cents to dollars
+        return {user_id: volume // 100 for user_id, volume in rows}  # Convert cents to dollars
     
     def _get_member_nfc_team(self, member: discord.Member) -> Optional[str]:
         """Get the NFC team abbreviation for a member based on their role."""
@@ -1474,8 +1802,7 @@ class PredictionMarketsCog(commands.Cog):
     
     def _get_user_own_team_playoff_bet(self, user_id: int, guild_id: int, team_abbr: str) -> int:
         """Get how much a user has bet on their own team making playoffs."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         team_name = NFC_TEAM_MARKET_NAMES.get(team_abbr, team_abbr)
         
@@ -1499,66 +1826,167 @@ class PredictionMarketsCog(commands.Cog):
             if row:
                 total_bet += row[0]  # Yes shares = dollars bet on team making playoffs
         
-        conn.close()
         return total_bet
     
-    def _get_nfc_members_status(self, guild: discord.Guild) -> List[Dict]:
-        """Get all NFC members and their prediction market status."""
-        nfc_status = []
+    def _nfc_roster(self, guild: discord.Guild) -> List[Tuple[int, str, Optional[str]]]:
+        """
+        Snapshot the guild's NFC owners as (user_id, display_name, team_abbr) tuples.
+        Runs on the event loop, since the gateway mutates member and role state there.
+        """
+        return [
+            (member.id, member.display_name, self._get_member_nfc_team(member))
+            for member in guild.members
+            if not member.bot and self._is_nfc_member(member)
+        ]
+    
+    def _get_nfc_members_status(self, guild_id: int, roster: List[Tuple[int, str, Optional[str]]]) -> Dict:
+        """
+        Get NFCMemberStatus rows for a _nfc_roster snapshot; runs on the database thread.
+        Returns 'members' in guild order, 'by_id' keyed by user_id, 'compliant', and the members
+        still short on a requirement, already sorted for display: 'needs_action' by total amount
+        missing, 'below_volume' by volume missing and 'missing_own_team' by own-team bet missing.
+        """
+        cached = self._nfc_status_cache.get(guild_id)
+        if cached and time.monotonic() - cached[0] < NFC_STATUS_CACHE_TTL:
+            return {key: members.copy() for key, members in cached[1].items()}
         
-        for member in guild.members:
-            if member.bot:
-                continue
+        nfc_status: List[NFCMemberStatus] = []
+        volumes = self._get_guild_prediction_volumes(guild_id)
+        
+        for user_id, name, team_abbr in roster:
+            volume = volumes.get(user_id, 0)
+            remaining = max(0, NFC_MIN_VOLUME_REQUIREMENT - volume)
             
-            if self._is_nfc_member(member):
-                volume = self._get_user_prediction_volume(member.id, guild.id)
-                remaining = max(0, NFC_MIN_VOLUME_REQUIREMENT - volume)
-                
-                # Get own-team playoff bet status
-                team_abbr = self._get_member_nfc_team(member)
-                own_team_bet = 0
-                own_team_remaining = NFC_OWN_TEAM_PLAYOFF_BET
-                if team_abbr:
-                    own_team_bet = self._get_user_own_team_playoff_bet(member.id, guild.id, team_abbr)
-                    own_team_remaining = max(0, NFC_OWN_TEAM_PLAYOFF_BET - own_team_bet)
-                
-                nfc_status.append({
-                    'user_id': member.id,
-                    'name': member.display_name,
-                    'team': team_abbr,
-                    'volume': volume,
-                    'remaining': remaining,
-                    'own_team_bet': own_team_bet,
-                    'own_team_remaining': own_team_remaining,
-                    'met_volume_requirement': volume >= NFC_MIN_VOLUME_REQUIREMENT,
-                    'met_own_team_requirement': own_team_bet >= NFC_OWN_TEAM_PLAYOFF_BET,
-                    'met_requirement': volume >= NFC_MIN_VOLUME_REQUIREMENT and own_team_bet >= NFC_OWN_TEAM_PLAYOFF_BET
-                })
-        
-        return nfc_status
+            # Get own-team playoff bet status
+            own_team_bet = 0
+            own_team_remaining = NFC_OWN_TEAM_PLAYOFF_BET
+            if team_abbr:
+                own_team_bet = self._get_user_own_team_playoff_bet(user_id, guild_id, team_abbr)
+                own_team_remaining = max(0, NFC_OWN_TEAM_PLAYOFF_BET - own_team_bet)
+            
+            nfc_status.append(NFCMemberStatus(
+                user_id=user_id,
+                name=name,
+                team=team_abbr,
+                volume=volume,
+                remaining=remaining,
+                own_team_bet=own_team_bet,
+                own_team_remaining=own_team_remaining,
+                met_volume_requirement=volume >= NFC_MIN_VOLUME_REQUIREMENT,
+                met_own_team_requirement=own_team_bet >= NFC_OWN_TEAM_PLAYOFF_BET,
+                met_requirement=volume >= NFC_MIN_VOLUME_REQUIREMENT and own_team_bet >= NFC_OWN_TEAM_PLAYOFF_BET,
+                far_behind=volume < NFC_MIN_VOLUME_REQUIREMENT / 2 or own_team_bet < NFC_OWN_TEAM_PLAYOFF_BET / 2
+            ))
+        
+        status = {
+            'members': nfc_status,
+            'by_id': {m.user_id: m for m in nfc_status},
+            'compliant': [m for m in nfc_status if m.met_requirement],
+            'needs_action': sorted(
+                (m for m in nfc_status if not m.met_requirement),
+                key=lambda m: m.remaining + m.own_team_remaining, reverse=True
+            ),
+            'below_volume': sorted(
+                (m for m in nfc_status if not m.met_volume_requirement),
+                key=attrgetter('remaining'), reverse=True
+            ),
+            'missing_own_team': sorted(
+                (m for m in nfc_status if not m.met_own_team_requirement),
+                key=attrgetter('own_team_remaining'), reverse=True
+            ),
+        }
+        self._nfc_status_cache[guild_id] = (time.monotonic(), status)
+        return {key: members.copy() for key, members in status.items()}
+    
+    @staticmethod
+    def _display_names(guild: discord.Guild, user_ids) -> Dict[int, str]:
+        """Resolve each user id to its member's display name once, falling back to "User <id>"."""
+        names = {}
+        for user_id in set(user_ids):
+            member = guild.get_member(user_id)
+            names[user_id] = member.display_name if member else f"User {user_id}"
+        return names
+    
+    @staticmethod
+    def _join_field(lines: Iterable[str], limit: int = EMBED_FIELD_LIMIT) -> str:
+        """
+        Join lines into an embed field value, stopping at the last whole line that fits.
+        Lines past the limit are never pulled, so a generator skips formatting them.
+        """
+        parts = []
+        length = -1  # No newline before the first line
+        for line in lines:
+            length += len(line) + 1
+            if length > limit:
+                if not parts:
+                    parts.append(line[:limit])
+                break
+            parts.append(line)
+        return "\n".join(parts)
+    
+    def _find_channel(self, guild: discord.Guild, *names: str) -> Optional[discord.TextChannel]:
+        """Get the guild's first text channel matching one of names, in order of preference."""
+        key = (guild.id, names)
+        if key in self._channel_ids:
+            channel_id = self._channel_ids[key]
+            return guild.get_channel(channel_id) if channel_id else None
+        
+        channel = None
+        for name in names:
+            channel = discord.utils.get(guild.text_channels, name=name)
+            if channel:
+                break
+        self._channel_ids[key] = channel.id if channel else None
+        return channel
+    
+    def _forget_channels(self, guild_id: int):
+        """Drop the guild's cached channel lookups."""
+        for key in [k for k in self._channel_ids if k[0] == guild_id]:
+            del self._channel_ids[key]
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        """A new channel may now win a cached name lookup."""
+        self._forget_channels(channel.guild.id)
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        """Stop pointing cached lookups at a deleted channel."""
+        self._forget_channels(channel.guild.id)
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        """Renames change which channel a name lookup should find."""
+        if before.name != after.name:
+            self._forget_channels(after.guild.id)
+    
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Get the cog's shared aiohttp session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
     
     async def _get_current_week(self, guild_id: int) -> int:
-        """Get current week from Snallabot."""
+        """Get current week from Snallabot, reusing a recent answer for the guild."""
+        cached = self._week_cache.get(guild_id)
+        if cached and time.monotonic() - cached[0] < CURRENT_WEEK_CACHE_TTL:
+            return cached[1]
+        
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT league_id FROM league_config WHERE guild_id = ? AND is_active = 1
-            ''', (guild_id,))
-            row = cursor.fetchone()
-            conn.close()
-            
-            if not row:
+            config = await self._get_snallabot_config(guild_id)
+            if not config:
                 return 0
             
-            league_id = row[0]
+            league_id = config['league_id']
             
-            async with aiohttp.ClientSession() as session:
-                url = f"{SNALLABOT_API_BASE}/league/{league_id}/week"
-                async with session.get(url, timeout=10) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('week', 0)
+            session = await self._ensure_session()
+            url = f"{SNALLABOT_API_BASE}/league/{league_id}/week"
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    week = data.get('week', 0)
+                    self._week_cache[guild_id] = (time.monotonic(), week)
+                    return week
         except Exception as e:
             logger.error(f"Error getting current week: {e}")
         
@@ -1568,18 +1996,14 @@ class PredictionMarketsCog(commands.Cog):
     async def check_nfc_requirements(self):
         """Daily check for NFC prediction market requirements."""
         logger.info("Running daily NFC requirement check...")
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # One timestamp for every guild's alert from this run
+        now = datetime.now()
         
         # Get all guilds with active markets
-        cursor.execute('''
+        guilds = await self._run_db(self._fetch_all, '''
             SELECT DISTINCT guild_id FROM prediction_markets WHERE status = 'active'
         ''')
         
-        guilds = cursor.fetchall()
-        conn.close()
-        
         for (guild_id,) in guilds:
             guild = self.bot.get_guild(guild_id)
             if not guild:
@@ -1595,18 +2019,14 @@ class PredictionMarketsCog(commands.Cog):
             weeks_remaining = NFC_DEADLINE_WEEK - current_week
             
             # Get NFC members who haven't met requirement
-            nfc_status = self._get_nfc_members_status(guild)
-            non_compliant = [m for m in nfc_status if not m['met_requirement']]
+            status = await self._run_db(self._get_nfc_members_status, guild.id, self._nfc_roster(guild))
+            non_compliant = status['needs_action']
             
             if not non_compliant:
                 continue
             
             # Find prediction-markets or announcements channel
-            channel = discord.utils.get(guild.text_channels, name='prediction-markets')
-            if not channel:
-                channel = discord.utils.get(guild.text_channels, name='announcements')
-            if not channel:
-                channel = discord.utils.get(guild.text_channels, name='townsquare')
+            channel = self._find_channel(guild, 'prediction-markets', 'announcements', 'townsquare')
             
             if not channel:
                 continue
@@ -1622,93 +2042,103 @@ class PredictionMarketsCog(commands.Cog):
                            f"• ${NFC_OWN_TEAM_PLAYOFF_BET} on YOUR team making playoffs\n\n"
                            f"Current Week: **{current_week}** | Weeks Remaining: **{weeks_remaining}**",
                 color=color,
-                timestamp=datetime.now()
+                timestamp=now
             )
             
-            # Separate by type of non-compliance
-            volume_non_compliant = [m for m in non_compliant if not m.get('met_volume_requirement', False)]
-            own_team_non_compliant = [m for m in non_compliant if not m.get('met_own_team_requirement', False)]
+            # Separate by type of non-compliance, each sorted by what's still missing
+            volume_non_compliant = status['below_volume']
+            own_team_non_compliant = status['missing_own_team']
             
             # List members below volume requirement
             if volume_non_compliant:
-                volume_str = ""
-                for m in sorted(volume_non_compliant, key=lambda x: x['remaining'], reverse=True)[:10]:
-                    volume_str += f"• **{m['name']}**: ${m['volume']}/${NFC_MIN_VOLUME_REQUIREMENT}\n"
+                volume_lines = [
+                    f"• **{m.name}**: ${m.volume}/${NFC_MIN_VOLUME_REQUIREMENT}"
+                    for m in volume_non_compliant[:10]
+                ]
                 embed.add_field(
                     name=f"💰 Below ${NFC_MIN_VOLUME_REQUIREMENT} Volume ({len(volume_non_compliant)})",
-                    value=volume_str[:1024],
+                    value=self._join_field(volume_lines),
                     inline=True
                 )
             
             # List members who haven't bet on own team
             if own_team_non_compliant:
-                own_team_str = ""
-                for m in sorted(own_team_non_compliant, key=lambda x: x.get('own_team_remaining', 50), reverse=True)[:10]:
-                    team = m.get('team', '?')
-                    bet = m.get('own_team_bet', 0)
-                    own_team_str += f"• **{m['name']}** ({team}): ${bet}/${NFC_OWN_TEAM_PLAYOFF_BET}\n"
+                own_team_lines = [
+                    f"• **{m.name}** ({m.team}): ${m.own_team_bet}/${NFC_OWN_TEAM_PLAYOFF_BET}"
+                    for m in own_team_non_compliant[:10]
+                ]
                 embed.add_field(
                     name=f"🏈 Own Team Playoff Bet ({len(own_team_non_compliant)})",
-                    value=own_team_str[:1024],
+                    value=self._join_field(own_team_lines),
                     inline=True
                 )
             
             embed.add_field(
                 name="💡 How to Participate",
-                value="1. View playoff markets: `/market view`\n"
-                      "2. Bet on your team: `/trade [marketID] Yes buy 50 [odds]`\n"
-                      "3. Check your status: `/nfcstatus`",
+                value=NFC_HOW_TO_PARTICIPATE,
                 inline=False
             )
             
-            embed.set_footer(text=f"Requirements: ${NFC_MIN_VOLUME_REQUIREMENT} total + ${NFC_OWN_TEAM_PLAYOFF_BET} on own team by Week {NFC_DEADLINE_WEEK}")
+            embed.set_footer(text=NFC_REMINDER_FOOTER)
             
             await channel.send(embed=embed)
             
             # DM members who are very behind (less than 50% and within 4 weeks)
             if weeks_remaining <= 4:
-                for m in non_compliant:
-                    # DM if below 50% on either requirement
-                    needs_dm = (m['volume'] < NFC_MIN_VOLUME_REQUIREMENT / 2 or 
-                               m.get('own_team_bet', 0) < NFC_OWN_TEAM_PLAYOFF_BET / 2)
-                    if needs_dm:
-                        member = guild.get_member(m['user_id'])
-                        if member:
-                            try:
-                                team = m.get('team', 'your team')
-                                team_name = NFC_TEAM_MARKET_NAMES.get(team, team)
-                                own_team_bet = m.get('own_team_bet', 0)
-                                own_team_remaining = m.get('own_team_remaining', NFC_OWN_TEAM_PLAYOFF_BET)
-                                
-                                dm_embed = discord.Embed(
-                                    title=f"{urgency} Prediction Market Requirement Reminder",
-                                    description=f"Hi {member.display_name}!\n\n"
-                                               f"As an NFC team owner ({team_name}), you have **two requirements** by **Week {NFC_DEADLINE_WEEK}**:\n\n"
-                                               f"**1️⃣ Total Volume:** ${m['volume']} / ${NFC_MIN_VOLUME_REQUIREMENT}\n"
-                                               f"**2️⃣ Own Team Playoff Bet:** ${own_team_bet} / ${NFC_OWN_TEAM_PLAYOFF_BET}\n\n"
-                                               f"**Weeks remaining:** {weeks_remaining}",
-                                    color=color
-                                )
-                                
-                                # Add specific guidance
-                                if own_team_remaining > 0:
-                                    dm_embed.add_field(
-                                        name=f"🏈 Bet on {team_name} Playoffs",
-                                        value=f"You need to bet **${own_team_remaining}** more on {team_name} making the playoffs!\n"
-                                              f"Find the '{team_name} Playoffs' market and buy Yes shares.",
-                                        inline=False
-                                    )
-                                
-                                dm_embed.add_field(
-                                    name="Quick Start",
-                                    value="1. `/market view` - See all markets\n"
-                                          "2. `/trade [marketID] Yes buy 50 [price]` - Place bet\n"
-                                          "3. `/nfcstatus` - Check your progress",
-                                    inline=False
-                                )
-                                await member.send(embed=dm_embed)
-                            except discord.Forbidden:
-                                pass  # Can't DM this user
+                # DM if below 50% on either requirement. Members come from the cache only; anyone
+                # not cached is dropped here, before an embed is built for them.
+                targets = [(guild.get_member(m.user_id), m) for m in non_compliant if m.far_behind]
+                targets = [(member, m) for member, m in targets if member is not None]
+                if not targets:
+                    continue
+                
+                semaphore = asyncio.Semaphore(NFC_DM_CONCURRENCY)
+                
+                async def send_reminder(member: discord.Member, m: NFCMemberStatus):
+                    async with semaphore:
+                        try:
+                            await member.send(embed=self._build_nfc_reminder(member, m, urgency, color, weeks_remaining))
+                        except discord.Forbidden:
+                            pass  # Can't DM this user
+                
+                # The sends overlap instead of queueing
+                await asyncio.gather(*[send_reminder(member, m) for member, m in targets])
+    
+    @staticmethod
+    def _build_nfc_reminder(member: discord.Member, m: NFCMemberStatus, urgency: str, color: discord.Color,
+                            weeks_remaining: int) -> discord.Embed:
+        """Build the requirement reminder DM for an NFC member who is well behind."""
+        team = m.team
+        team_name = NFC_TEAM_MARKET_NAMES.get(team, team)
+        own_team_bet = m.own_team_bet
+        own_team_remaining = m.own_team_remaining
+        
+        dm_embed = discord.Embed(
+            title=f"{urgency} Prediction Market Requirement Reminder",
+            description=f"Hi {member.display_name}!\n\n"
+                       f"As an NFC team owner ({team_name}), you have **two requirements** by **Week {NFC_DEADLINE_WEEK}**:\n\n"
+                       f"**1️⃣ Total Volume:** ${m.volume} / ${NFC_MIN_VOLUME_REQUIREMENT}\n"
+                       f"**2️⃣ Own Team Playoff Bet:** ${own_team_bet} / ${NFC_OWN_TEAM_PLAYOFF_BET}\n\n"
+                       f"**Weeks remaining:** {weeks_remaining}",
+            color=color
+        )
+        
+        # Add specific guidance
+        if own_team_remaining > 0:
+            dm_embed.add_field(
+                name=f"🏈 Bet on {team_name} Playoffs",
+                value=f"You need to bet **${own_team_remaining}** more on {team_name} making the playoffs!\n"
+                      f"Find the '{team_name} Playoffs' market and buy Yes shares.",
+                inline=False
+            )
+        
+        dm_embed.add_field(
+            name="Quick Start",
+            value=NFC_DM_QUICK_START,
+            inline=False
+        )
+        
+        return dm_embed
     
     @check_nfc_requirements.before_loop
     async def before_check_nfc_requirements(self):
@@ -1720,7 +2150,10 @@ class PredictionMarketsCog(commands.Cog):
         """Check NFC members' prediction market requirement status."""
         await interaction.response.defer()
         
-        nfc_status = self._get_nfc_members_status(interaction.guild)
+        status = await self._run_db(
+            self._get_nfc_members_status, interaction.guild.id, self._nfc_roster(interaction.guild)
+        )
+        nfc_status = status['members']
         
         if not nfc_status:
             await interaction.followup.send("No NFC team owners found.", ephemeral=True)
@@ -1729,10 +2162,9 @@ class PredictionMarketsCog(commands.Cog):
         current_week = await self._get_current_week(interaction.guild.id)
         weeks_remaining = max(0, NFC_DEADLINE_WEEK - current_week)
         
-        # Separate compliant and non-compliant
-        compliant = [m for m in nfc_status if m['met_requirement']]
-        non_compliant = sorted([m for m in nfc_status if not m['met_requirement']], 
-                               key=lambda x: x['remaining'] + x.get('own_team_remaining', 0), reverse=True)
+        # Compliant and non-compliant, the latter already sorted by how much is missing
+        compliant = status['compliant']
+        non_compliant = status['needs_action']
         
         embed = discord.Embed(
             title="📊 NFC Prediction Market Requirement Status",
@@ -1746,46 +2178,38 @@ class PredictionMarketsCog(commands.Cog):
         
         # Compliant members (met BOTH requirements)
         if compliant:
-            compliant_str = ""
-            for m in compliant[:10]:
-                team = m.get('team', '?')
-                compliant_str += f"✅ **{m['name']}** ({team}): ${m['volume']} vol, ${m.get('own_team_bet', 0)} own team\n"
+            compliant_text = "\n".join(map(_fmt_compliant, compliant[:10]))
             if len(compliant) > 10:
-                compliant_str += f"... and {len(compliant) - 10} more"
-            embed.add_field(name=f"✅ Fully Compliant ({len(compliant)})", value=compliant_str or "None yet", inline=False)
+                compliant_text += f"\n... and {len(compliant) - 10} more"
+            embed.add_field(name=f"✅ Fully Compliant ({len(compliant)})", value=compliant_text or "None yet", inline=False)
         
         # Non-compliant members
         if non_compliant:
-            non_compliant_str = ""
-            for m in non_compliant[:10]:
-                team = m.get('team', '?')
-                vol_status = "✅" if m.get('met_volume_requirement', False) else "❌"
-                own_status = "✅" if m.get('met_own_team_requirement', False) else "❌"
-                non_compliant_str += f"**{m['name']}** ({team}): {vol_status}${m['volume']}vol {own_status}${m.get('own_team_bet', 0)}own\n"
+            non_compliant_text = "\n".join(map(_fmt_noncompliant, non_compliant[:10]))
             if len(non_compliant) > 10:
-                non_compliant_str += f"... and {len(non_compliant) - 10} more"
-            embed.add_field(name=f"❌ Needs Action ({len(non_compliant)})", value=non_compliant_str, inline=False)
+                non_compliant_text += f"\n... and {len(non_compliant) - 10} more"
+            embed.add_field(name=f"❌ Needs Action ({len(non_compliant)})", value=non_compliant_text, inline=False)
         
         # Check if user is NFC and show their detailed status
-        user_status = next((m for m in nfc_status if m['user_id'] == interaction.user.id), None)
+        user_status = status['by_id'].get(interaction.user.id)
         if user_status:
-            team = user_status.get('team', '?')
+            team = user_status.team
             team_name = NFC_TEAM_MARKET_NAMES.get(team, team)
             
-            vol_emoji = "✅" if user_status.get('met_volume_requirement', False) else "❌"
-            own_emoji = "✅" if user_status.get('met_own_team_requirement', False) else "❌"
-            overall_emoji = "✅" if user_status['met_requirement'] else "❌"
+            vol_emoji = "✅" if user_status.met_volume_requirement else "❌"
+            own_emoji = "✅" if user_status.met_own_team_requirement else "❌"
+            overall_emoji = "✅" if user_status.met_requirement else "❌"
             
-            status_text = f"{vol_emoji} **Total Volume:** ${user_status['volume']} / ${NFC_MIN_VOLUME_REQUIREMENT}\n"
-            status_text += f"{own_emoji} **{team_name} Playoff Bet:** ${user_status.get('own_team_bet', 0)} / ${NFC_OWN_TEAM_PLAYOFF_BET}\n\n"
+            status_text = f"{vol_emoji} **Total Volume:** ${user_status.volume} / ${NFC_MIN_VOLUME_REQUIREMENT}\n"
+            status_text += f"{own_emoji} **{team_name} Playoff Bet:** ${user_status.own_team_bet} / ${NFC_OWN_TEAM_PLAYOFF_BET}\n\n"
             
-            if user_status['met_requirement']:
+            if user_status.met_requirement:
                 status_text += "🎉 **All requirements met!**"
             else:
-                if not user_status.get('met_volume_requirement', False):
-                    status_text += f"• Need ${user_status['remaining']} more total volume\n"
-                if not user_status.get('met_own_team_requirement', False):
-                    status_text += f"• Need ${user_status.get('own_team_remaining', NFC_OWN_TEAM_PLAYOFF_BET)} more on {team_name} playoffs"
+                if not user_status.met_volume_requirement:
+                    status_text += f"• Need ${user_status.remaining} more total volume\n"
+                if not user_status.met_own_team_requirement:
+                    status_text += f"• Need ${user_status.own_team_remaining} more on {team_name} playoffs"
             
             embed.add_field(
                 name=f"📍 Your Status ({team_name})",
@@ -1800,30 +2224,22 @@ class PredictionMarketsCog(commands.Cog):
         """View unpaid prediction market payments."""
         await interaction.response.defer(ephemeral=True)
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         # Get payments owed TO the user (they are the winner)
-        cursor.execute('''
+        owed_to_user = await self._run_db(self._fetch_all, '''
             SELECT p.payment_id, p.market_id, p.loser_id, p.amount, p.created_at, m.question
             FROM prediction_payments p
             JOIN prediction_markets m ON p.market_id = m.market_id
             WHERE p.winner_id = ? AND p.guild_id = ? AND p.is_paid = 0
         ''', (interaction.user.id, interaction.guild.id))
         
-        owed_to_user = cursor.fetchall()
-        
         # Get payments owed BY the user (they are the loser)
-        cursor.execute('''
+        owed_by_user = await self._run_db(self._fetch_all, '''
             SELECT p.payment_id, p.market_id, p.winner_id, p.amount, p.created_at, m.question
             FROM prediction_payments p
             JOIN prediction_markets m ON p.market_id = m.market_id
             WHERE p.loser_id = ? AND p.guild_id = ? AND p.is_paid = 0
         ''', (interaction.user.id, interaction.guild.id))
         
-        owed_by_user = cursor.fetchall()
-        conn.close()
-        
         embed = discord.Embed(
             title="💰 Your Prediction Market Payments",
             color=discord.Color.gold(),
@@ -1832,16 +2248,15 @@ class PredictionMarketsCog(commands.Cog):
         
         # Payments owed TO user
         if owed_to_user:
-            owed_str = ""
-            total_owed_to = 0
-            for payment_id, market_id, loser_id, amount, created_at, question in owed_to_user:
-                loser = interaction.guild.get_member(loser_id)
-                loser_name = loser.display_name if loser else f"User {loser_id}"
-                owed_str += f"• **${amount}** from {loser_name} ({market_id})\n"
-                total_owed_to += amount
+            names = self._display_names(interaction.guild, [row[2] for row in owed_to_user])
+            total_owed_to = sum(row[3] for row in owed_to_user)
+            owed_lines = (
+                f"• **${amount}** from {names[loser_id]} ({market_id})"
+                for payment_id, market_id, loser_id, amount, created_at, question in owed_to_user
+            )
             embed.add_field(
                 name=f"💵 Owed TO You (${total_owed_to})",
-                value=owed_str[:1024],
+                value=self._join_field(owed_lines),
                 inline=False
             )
         else:
@@ -1849,16 +2264,15 @@ class PredictionMarketsCog(commands.Cog):
         
         # Payments owed BY user
         if owed_by_user:
-            owed_str = ""
-            total_owed_by = 0
-            for payment_id, market_id, winner_id, amount, created_at, question in owed_by_user:
-                winner = interaction.guild.get_member(winner_id)
-                winner_name = winner.display_name if winner else f"User {winner_id}"
-                owed_str += f"• **${amount}** to {winner_name} ({market_id}) - `/predictionpaid {payment_id}`\n"
-                total_owed_by += amount
+            names = self._display_names(interaction.guild, [row[2] for row in owed_by_user])
+            total_owed_by = sum(row[3] for row in owed_by_user)
+            owed_lines = (
+                f"• **${amount}** to {names[winner_id]} ({market_id}) - `/predictionpaid {payment_id}`"
+                for payment_id, market_id, winner_id, amount, created_at, question in owed_by_user
+            )
             embed.add_field(
                 name=f"💸 Owed BY You (${total_owed_by})",
-                value=owed_str[:1024],
+                value=self._join_field(owed_lines),
                 inline=False
             )
         else:
@@ -1872,29 +2286,22 @@ class PredictionMarketsCog(commands.Cog):
         """Mark a prediction market payment as paid."""
         await interaction.response.defer()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         # Get the payment
-        cursor.execute('''
+        payment = await self._run_db(self._fetch_one, '''
             SELECT p.market_id, p.winner_id, p.loser_id, p.amount, p.is_paid, m.question
             FROM prediction_payments p
             JOIN prediction_markets m ON p.market_id = m.market_id
             WHERE p.payment_id = ? AND p.guild_id = ?
         ''', (payment_id, interaction.guild.id))
         
-        payment = cursor.fetchone()
-        
         if not payment:
             await interaction.followup.send(f"❌ Payment #{payment_id} not found.", ephemeral=True)
-            conn.close()
             return
         
         market_id, winner_id, loser_id, amount, is_paid, question = payment
         
         if is_paid:
             await interaction.followup.send(f"✅ Payment #{payment_id} is already marked as paid.", ephemeral=True)
-            conn.close()
             return
         
         # Only the winner can mark as paid (they received the money)
@@ -1905,19 +2312,15 @@ class PredictionMarketsCog(commands.Cog):
                 f"❌ Only **{winner_name}** (the winner) can confirm receipt of this payment.",
                 ephemeral=True
             )
-            conn.close()
             return
         
         # Mark as paid
-        cursor.execute('''
+        await self._run_db(self._execute, '''
             UPDATE prediction_payments
             SET is_paid = 1, paid_at = ?
             WHERE payment_id = ?
         ''', (datetime.now().isoformat(), payment_id))
         
-        conn.commit()
-        conn.close()
-        
         loser = interaction.guild.get_member(loser_id)
         loser_name = loser.display_name if loser else f"User {loser_id}"
         
@@ -1951,20 +2354,14 @@ class PredictionMarketsCog(commands.Cog):
         """View all unpaid prediction market payments in the server."""
         await interaction.response.defer()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        payments = await self._run_db(self._fetch_all, '''
             SELECT p.payment_id, p.market_id, p.winner_id, p.loser_id, p.amount, p.created_at, m.question
             FROM prediction_payments p
             JOIN prediction_markets m ON p.market_id = m.market_id
             WHERE p.guild_id = ? AND p.is_paid = 0
-            ORDER BY p.created_at DESC
+            ORDER BY p.created_at DESC, p.payment_id DESC
         ''', (interaction.guild.id,))
         
-        payments = cursor.fetchall()
-        conn.close()
-        
         if not payments:
             await interaction.followup.send("✅ No unpaid prediction market payments!")
             return
@@ -1978,18 +2375,18 @@ class PredictionMarketsCog(commands.Cog):
             timestamp=datetime.now()
         )
         
-        payments_str = ""
+        payment_lines = []
         for payment_id, market_id, winner_id, loser_id, amount, created_at, question in payments[:15]:
             winner = interaction.guild.get_member(winner_id)
             loser = interaction.guild.get_member(loser_id)
             winner_name = winner.display_name if winner else f"User {winner_id}"
             loser_name = loser.display_name if loser else f"User {loser_id}"
-            payments_str += f"#{payment_id}: {loser_name} → {winner_name} **${amount}** ({market_id})\n"
+            payment_lines.append(f"#{payment_id}: {loser_name} → {winner_name} **${amount}** ({market_id})")
         
         if len(payments) > 15:
-            payments_str += f"\n... and {len(payments) - 15} more"
+            payment_lines.append(f"\n... and {len(payments) - 15} more")
         
-        embed.add_field(name="Pending Payments", value=payments_str or "None", inline=False)
+        embed.add_field(name="Pending Payments", value="\n".join(payment_lines) or "None", inline=False)
         
         await interaction.followup.send(embed=embed)
 
@@ -9,10 +9,14 @@ from discord import app_commands
 import sqlite3
 from datetime import datetime
 import logging
+import time
 from typing import Optional, Literal
 
 logger = logging.getLogger('MistressLIV.Wagers')
 
+# Seconds a computed wagerboard is reused before re-querying
+WAGERBOARD_CACHE_TTL = 30
+
 # NFL Teams for autocomplete
 NFL_TEAMS = [
     'ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE',
@@ -119,6 +123,8 @@ class WagersCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db_path = bot.db_path
+        # (computed_at, (top_users, bottom_users, totals)) for /wagerboard
+        self._board_cache = None
         self._ensure_tables()
     
     def get_current_season(self, guild_id: int) -> int:
@@ -256,6 +262,9 @@ class WagersCog(commands.Cog):
             except:
                 pass
         
+        # Winner lookups drive the wagerboard aggregation and unpaid-wager queries
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_wagers_winner ON wagers(winner_user_id)')
+        
         conn.commit()
         conn.close()
     
@@ -834,6 +843,7 @@ class WagersCog(commands.Cog):
         ''', (wager_winner, winning_team_norm, wager_id))
         conn.commit()
         conn.close()
+        self._board_cache = None
         
         winner_member = interaction.guild.get_member(wager_winner)
         loser_member = interaction.guild.get_member(wager_loser)
@@ -929,6 +939,11 @@ class WagersCog(commands.Cog):
             ''', (interaction.user.id,))
         
         wagers = cursor.fetchall()
+        
+        # A single match is settled on the same connection, no second lookup needed
+        if len(wagers) == 1:
+            cursor.execute('UPDATE wagers SET is_paid = 1 WHERE wager_id = ?', (wagers[0][0],))
+            conn.commit()
         conn.close()
         
         if not wagers:
@@ -944,12 +959,6 @@ class WagersCog(commands.Cog):
             wager_id, home_user, away_user, amount, winner, home_team, away_team, season, week = wager
             loser_id = away_user if winner == home_user else home_user
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('UPDATE wagers SET is_paid = 1 WHERE wager_id = ?', (wager_id,))
-            conn.commit()
-            conn.close()
-            
             loser_member = interaction.guild.get_member(loser_id)
             loser_name = loser_member.display_name if loser_member else f"User {loser_id}"
             away_name = TEAM_NAMES.get(away_team, away_team)
@@ -1015,88 +1024,88 @@ class WagersCog(commands.Cog):
         view = WagerPaidSelectView(options, self.db_path, interaction.guild, self)
         await interaction.followup.send(embed=embed, view=view)
     
-    @app_commands.command(name="wagerboard", description="View the wager leaderboard")
-    async def wagerboard(self, interaction: discord.Interaction):
-        """View the wager leaderboard showing top winners and losers."""
-        await interaction.response.defer()
+    def _get_wagerboard(self):
+        """Return (top_users, bottom_users, totals) for /wagerboard, reusing a recent result."""
+        if self._board_cache and time.monotonic() - self._board_cache[0] < WAGERBOARD_CACHE_TTL:
+            return self._board_cache[1]
         
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        # Get all completed wagers
+        # Net wager and season-payout results per user, aggregated in SQL;
+        # only the top five and the five biggest (negative) losers come back
         cursor.execute('''
-            SELECT home_user_id, away_user_id, amount, winner_user_id, challenger_pick, opponent_pick
-            FROM wagers WHERE winner_user_id IS NOT NULL
-        ''')
-        
-        wagers = cursor.fetchall()
-        
-        # Get season payouts from payments table (earnings received)
-        cursor.execute('''
-            SELECT payee_discord_id, SUM(amount) as total_earned
-            FROM payments WHERE is_paid = 1
-            GROUP BY payee_discord_id
+            WITH w AS (
+                SELECT winner_user_id AS uid, SUM(amount) AS won, 0 AS lost
+                FROM wagers WHERE winner_user_id IS NOT NULL
+                GROUP BY winner_user_id
+                UNION ALL
+                SELECT CASE WHEN winner_user_id = home_user_id THEN away_user_id ELSE home_user_id END,
+                       0, SUM(amount)
+                FROM wagers WHERE winner_user_id IS NOT NULL
+                GROUP BY 1
+            ),
+            p AS (
+                SELECT payee_discord_id AS uid, SUM(amount) AS earned, 0 AS paid
+                FROM payments WHERE is_paid = 1
+                GROUP BY payee_discord_id
+                UNION ALL
+                SELECT payer_discord_id, 0, SUM(amount)
+                FROM payments WHERE is_paid = 1
+                GROUP BY payer_discord_id
+            ),
+            nets AS (
+                SELECT uid,
+                       SUM(won) - SUM(lost) + SUM(earned) - SUM(paid) AS net,
+                       SUM(won) - SUM(lost) AS wager_net,
+                       SUM(earned) - SUM(paid) AS season_net
+                FROM (
+                    SELECT uid, won, lost, 0 AS earned, 0 AS paid FROM w
+                    UNION ALL
+                    SELECT uid, 0, 0, earned, paid FROM p
+                )
+                GROUP BY uid
+            )
+            SELECT * FROM (
+                SELECT 'top' AS board, -net AS rank_key, * FROM nets ORDER BY net DESC LIMIT 5
+            )
+            UNION ALL
+            SELECT * FROM (
+                SELECT 'bottom', net, * FROM nets WHERE net < 0 ORDER BY net ASC LIMIT 5
+            )
+            ORDER BY board DESC, rank_key
         ''')
-        season_earnings = {row[0]: row[1] for row in cursor.fetchall()}
+        board_rows = cursor.fetchall()
+        top_users = [row[2:] for row in board_rows if row[0] == 'top']
+        bottom_users = [row[2:] for row in board_rows if row[0] == 'bottom']
         
-        # Get season dues paid (losses from payments)
+        # League-wide totals for the stats field
         cursor.execute('''
-            SELECT payer_discord_id, SUM(amount) as total_paid
-            FROM payments WHERE is_paid = 1
-            GROUP BY payer_discord_id
+            SELECT
+                (SELECT COUNT(*) FROM wagers WHERE winner_user_id IS NOT NULL),
+                (SELECT COALESCE(SUM(amount), 0) FROM wagers WHERE winner_user_id IS NOT NULL),
+                (SELECT COALESCE(SUM(amount), 0) FROM payments WHERE is_paid = 1)
         ''')
-        season_dues = {row[0]: row[1] for row in cursor.fetchall()}
+        totals = cursor.fetchone()
         
         conn.close()
         
-        # Calculate stats for each user (combining wagers + season payouts)
-        user_stats = {}
-        
-        # Process wagers
-        for home_user, away_user, amount, winner, challenger_pick, opponent_pick in wagers:
-            for user_id in [home_user, away_user]:
-                if user_id not in user_stats:
-                    user_stats[user_id] = {
-                        'wager_wins': 0, 'wager_losses': 0, 
-                        'wager_won': 0.0, 'wager_lost': 0.0,
-                        'season_earned': 0.0, 'season_paid': 0.0
-                    }
-            
-            loser = away_user if winner == home_user else home_user
-            user_stats[winner]['wager_wins'] += 1
-            user_stats[winner]['wager_won'] += amount
-            user_stats[loser]['wager_losses'] += 1
-            user_stats[loser]['wager_lost'] += amount
-        
-        # Add season earnings/dues to user stats
-        all_users = set(list(season_earnings.keys()) + list(season_dues.keys()) + list(user_stats.keys()))
-        for user_id in all_users:
-            if user_id not in user_stats:
-                user_stats[user_id] = {
-                    'wager_wins': 0, 'wager_losses': 0,
-                    'wager_won': 0.0, 'wager_lost': 0.0,
-                    'season_earned': 0.0, 'season_paid': 0.0
-                }
-            user_stats[user_id]['season_earned'] = season_earnings.get(user_id, 0.0)
-            user_stats[user_id]['season_paid'] = season_dues.get(user_id, 0.0)
-        
-        if not user_stats:
+        result = (top_users, bottom_users, totals)
+        self._board_cache = (time.monotonic(), result)
+        return result
+    
+    @app_commands.command(name="wagerboard", description="View the wager leaderboard")
+    async def wagerboard(self, interaction: discord.Interaction):
+        """View the wager leaderboard showing top winners and losers."""
+        await interaction.response.defer()
+        
+        top_users, bottom_users, totals = self._get_wagerboard()
+        total_wagers, total_wager_money, total_season_money = totals
+        
+        if not top_users:
             await interaction.followup.send("📭 No earnings data yet!")
             return
         
-        # Calculate total net for each user
-        def calc_net(stats):
-            wager_net = stats['wager_won'] - stats['wager_lost']
-            season_net = stats['season_earned'] - stats['season_paid']
-            return wager_net + season_net
-        
-        # Sort by total net earnings
-        sorted_users = sorted(
-            user_stats.items(),
-            key=lambda x: calc_net(x[1]),
-            reverse=True
-        )
-        
         embed = discord.Embed(
             title="💰 Overall Earnings Leaderboard",
             description="Combined wager + season payout earnings",
@@ -1105,36 +1114,25 @@ class WagersCog(commands.Cog):
         
         # Top earners
         top_earners = []
-        for i, (user_id, stats) in enumerate(sorted_users[:5], 1):
+        for i, (user_id, total_net, wager_net, season_net) in enumerate(top_users, 1):
             member = interaction.guild.get_member(user_id)
             name = member.display_name if member else f"<@{user_id}>"
-            total_net = calc_net(stats)
-            wager_net = stats['wager_won'] - stats['wager_lost']
-            season_net = stats['season_earned'] - stats['season_paid']
             medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
             top_earners.append(f"{medal} **{name}**: **${total_net:+.2f}**\n    Wagers: ${wager_net:+.2f} | Season: ${season_net:+.2f}")
         
         embed.add_field(name="🏆 Top Earners", value="\n".join(top_earners) or "No data", inline=False)
         
         # Biggest losers (bottom of the list)
-        bottom_users = [u for u in sorted_users if calc_net(u[1]) < 0]
-        bottom_users = sorted(bottom_users, key=lambda x: calc_net(x[1]))[:5]
         biggest_losers = []
-        for i, (user_id, stats) in enumerate(bottom_users, 1):
+        for i, (user_id, total_net, wager_net, season_net) in enumerate(bottom_users, 1):
             member = interaction.guild.get_member(user_id)
             name = member.display_name if member else f"<@{user_id}>"
-            total_net = calc_net(stats)
-            wager_net = stats['wager_won'] - stats['wager_lost']
-            season_net = stats['season_earned'] - stats['season_paid']
             biggest_losers.append(f"{i}. **{name}**: **${total_net:+.2f}**\n    Wagers: ${wager_net:+.2f} | Season: ${season_net:+.2f}")
         
         if biggest_losers:
             embed.add_field(name="📉 Biggest Losers", value="\n".join(biggest_losers), inline=False)
         
         # Total stats
-        total_wagers = len(wagers)
-        total_wager_money = sum(w[2] for w in wagers)
-        total_season_money = sum(season_earnings.values())
         embed.add_field(
             name="📊 Overall Stats",
             value=f"Total Wagers: **{total_wagers}** (${total_wager_money:.2f})\nSeason Payouts: **${total_season_money:.2f}**",